@@ -20,13 +20,13 @@ except ImportError:
         AlbumInfo, SessionInfo, ConfigUpdate, ErrorResponse
     )
 try:
-    from app.core.downloader import GooglePhotosDownloader
-    from app.core.session import DownloadSession
+    from app.core.downloader import GooglePhotosDownloader, RateLimitedError, backoff_delay
+    from app.core.session import PROGRESS_FLUSH_EVERY, DownloadSession
     from app.core.config import ConfigManager
     from app.api.websockets import ConnectionManager
 except ImportError:
-    from core.downloader import GooglePhotosDownloader
-    from core.session import DownloadSession
+    from core.downloader import GooglePhotosDownloader, RateLimitedError, backoff_delay
+    from core.session import PROGRESS_FLUSH_EVERY, DownloadSession
     from core.config import ConfigManager
     from api.websockets import ConnectionManager
 
@@ -37,6 +37,12 @@ connection_manager = ConnectionManager()
 # Global downloader instance
 downloader = None
 
+# Seconds between session snapshots while a download is running
+CHECKPOINT_INTERVAL = 5.0
+
+# Times an item is retried after Google answers HTTP 429
+RATE_LIMIT_RETRIES = 5
+
 
 @router.get("/auth/status", response_model=AuthStatus)
 async def get_auth_status():
@@ -163,13 +169,18 @@ async def start_download(request: DownloadRequest, background_tasks: BackgroundT
         session.download_params = request.dict()
         
         # Set up callbacks for real-time updates - FIXED asyncio issue
-        async def progress_callback(current, total, percentage, speed, eta):
-            await connection_manager.send_progress_update(
+        # The downloader calls these from worker threads; hand the sends to the loop
+        loop = asyncio.get_running_loop()
+        
+        def progress_callback(current, total, percentage, speed, eta):
+            asyncio.run_coroutine_threadsafe(connection_manager.send_progress_update(
                 session.session_id, current, total, percentage, speed, eta, "downloading"
-            )
+            ), loop)
         
-        async def status_callback(message):
-            await connection_manager.send_status_message(session.session_id, message)
+        def status_callback(message):
+            asyncio.run_coroutine_threadsafe(
+                connection_manager.send_status_message(session.session_id, message), loop
+            )
         
         downloader.set_callbacks(progress_callback, status_callback)
         
@@ -203,13 +214,18 @@ async def resume_download(request: ResumeRequest, background_tasks: BackgroundTa
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Set up callbacks - FIXED asyncio issue
-        async def progress_callback(current, total, percentage, speed, eta):
-            await connection_manager.send_progress_update(
+        # The downloader calls these from worker threads; hand the sends to the loop
+        loop = asyncio.get_running_loop()
+        
+        def progress_callback(current, total, percentage, speed, eta):
+            asyncio.run_coroutine_threadsafe(connection_manager.send_progress_update(
                 session.session_id, current, total, percentage, speed, eta, "resuming"
-            )
+            ), loop)
         
-        async def status_callback(message):
-            await connection_manager.send_status_message(session.session_id, message)
+        def status_callback(message):
+            asyncio.run_coroutine_threadsafe(
+                connection_manager.send_status_message(session.session_id, message), loop
+            )
         
         downloader.set_callbacks(progress_callback, status_callback)
         
@@ -358,6 +374,10 @@ async def _resume_download(downloader: GooglePhotosDownloader, session: Download
             )
             return
         
+        # Base URLs saved with the session expire after about an hour
+        await downloader.refresh_base_urls(remaining_items)
+        # A resume interrupted again shouldn't start from the stale URLs
+        session.save_state()
         await _download_items(downloader, session, remaining_items)
         
     except Exception as e:
@@ -367,78 +387,73 @@ async def _resume_download(downloader: GooglePhotosDownloader, session: Download
 
 
 async def _download_items(downloader: GooglePhotosDownloader, session: DownloadSession, items: list):
-    """Download items with concurrent workers - FIXED asyncio conflicts."""
-    from pathlib import Path
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    import asyncio
-    import functools
-    
+    """Download items concurrently, at most download.max_workers at a time."""
     output_path = Path(session.output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
     max_workers = config.get('download.max_workers', 5)
     success_count = 0
     failed_count = 0
+    downloader.stats.start(len(items))
+    downloader.index_output_dir(output_path)
     
-    # Get current event loop
-    loop = asyncio.get_event_loop()
+    # One task per item, gated by a semaphore; the blocking requests download
+    # runs in the default thread pool
+    semaphore = asyncio.Semaphore(max_workers)
     
-    # Use ThreadPoolExecutor for concurrent downloads
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit download tasks - run in executor to avoid blocking
-        future_to_item = {}
-        for item in items:
+    async def download(item):
+        async with semaphore:
+            if downloader.cancelled:
+                return item, False, 0
+            try:
+                success, file_size = await _download_with_backoff(downloader, item, output_path)
+            except Exception as e:
+                await connection_manager.send_status_message(
+                    session.session_id, f"Error downloading {item.get('filename', 'unknown')}: {str(e)}", "error"
+                )
+                return item, False, 0
+            return item, success, file_size
+    
+    tasks = [asyncio.create_task(download(item)) for item in items]
+    checkpointer = asyncio.create_task(_checkpoint_periodically(session))
+    completed = 0
+    total_items = len(items)
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item, success, file_size = await next_done
             if downloader.cancelled:
                 break
+            completed += 1
             
-            # Use loop.run_in_executor instead of creating new event loops
-            future = loop.run_in_executor(
-                executor,
-                functools.partial(_download_item_sync_fixed, downloader, item, output_path)
+            # Update progress
+            percentage = (completed / total_items) * 100
+            downloader.stats.update(file_size)
+            
+            # Send progress update via WebSocket
+            await connection_manager.send_progress_update(
+                session.session_id, completed, total_items, percentage,
+                downloader.stats.get_speed_mbps(), downloader.stats.get_eta_seconds(),
+                "downloading"
             )
-            future_to_item[future] = item
-        
-        # Process completed downloads
-        completed = 0
-        total_items = len(items)
-        
-        for future in asyncio.as_completed(future_to_item.keys()):
-            if downloader.cancelled:
-                break
             
-            item = future_to_item[future]
-            try:
-                success, file_size = await future
-                completed += 1
-                
-                # Update progress
-                percentage = (completed / total_items) * 100
-                downloader.stats.update(file_size)
-                
-                # Send progress update via WebSocket
-                await connection_manager.send_progress_update(
-                    session.session_id, completed, total_items, percentage,
-                    downloader.stats.get_speed_mbps(), downloader.stats.get_eta_seconds(),
-                    "downloading"
-                )
-                
-                if success:
-                    success_count += 1
-                    session.mark_completed(item['id'])
-                else:
-                    failed_count += 1
-                    session.mark_failed(item['id'])
-                
-                # Save state periodically
-                if completed % 10 == 0:
-                    session.save_state()
-                
-            except Exception as e:
+            if success:
+                success_count += 1
+                session.mark_completed(item['id'])
+            else:
                 failed_count += 1
                 session.mark_failed(item['id'])
-                await connection_manager.send_status_message(
-                    session.session_id, f"Error downloading {item.get('filename', 'unknown')}: {str(e)}", "error"
-                )
+            
+            # state.json was written before the run; between full snapshots
+            # only the progress log's new records need to reach disk
+            if completed % PROGRESS_FLUSH_EVERY == 0:
+                session.flush_progress()
+    finally:
+        # Items still waiting on the semaphore never start
+        checkpointer.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(checkpointer, return_exceptions=True)
     
     # Final status
     session.save_state()
@@ -457,80 +472,24 @@ async def _download_items(downloader: GooglePhotosDownloader, session: DownloadS
         )
 
 
-def _download_item_sync_fixed(downloader: GooglePhotosDownloader, item: dict, output_path: Path):
-    """Synchronous download without creating new event loops."""
-    try:
-        # Convert async method to sync using requests directly
-        filename = item['filename']
-        media_metadata = item['mediaMetadata']
-        
-        # Create safe filename with timestamp
-        from datetime import datetime
-        
-        creation_time = media_metadata['creationTime']
-        timestamp = datetime.fromisoformat(creation_time.replace('Z', '+00:00'))
-        safe_timestamp = timestamp.strftime('%Y%m%d_%H%M%S')
-        
-        # Use pathlib for file extension handling
-        file_path_obj = Path(filename)
-        name = file_path_obj.stem
-        ext = file_path_obj.suffix
-        safe_filename = f"{safe_timestamp}_{name}{ext}"
-        file_path = output_path / safe_filename
-        
-        # Skip if exact file already exists
-        if file_path.exists():
-            existing_size = file_path.stat().st_size
-            return True, existing_size
-        
-        # Determine download URL based on media type
-        if 'photo' in media_metadata:
-            download_url = f"{item['baseUrl']}=d"  # Original quality photo
-        elif 'video' in media_metadata:
-            download_url = f"{item['baseUrl']}=dv"  # Original quality video
-        else:
-            return False, 0
-        
-        # Download with retry logic
-        import requests
-        import time
-        
-        max_retries = 3
-        for attempt in range(max_retries):
-            if downloader.cancelled:
-                return False, 0
-                
-            try:
-                timeout = downloader.config.get('download.timeout', 30)
-                chunk_size = downloader.config.get('download.chunk_size', 8192)
-                
-                response = requests.get(download_url, stream=True, timeout=timeout)
-                response.raise_for_status()
-                
-                # Create temporary file first
-                temp_file = file_path.with_suffix(f"{file_path.suffix}.tmp")
-                file_size = 0
-                
-                with open(temp_file, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if downloader.cancelled:
-                            f.close()
-                            temp_file.unlink(missing_ok=True)
-                            return False, 0
-                        f.write(chunk)
-                        file_size += len(chunk)
-                
-                # Move temp file to final location
-                temp_file.rename(file_path)
-                return True, file_size
-                
-            except (requests.RequestException, IOError) as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    return False, 0
-        
-        return False, 0
-        
-    except Exception as e:
-        return False, 0
\ No newline at end of file
+async def _checkpoint_periodically(session: DownloadSession):
+    """Persist session state at most once per interval, and only when it changed.
+    
+    Keeps the meta.json summary that the sessions list reads current mid-run.
+    """
+    while True:
+        await asyncio.sleep(CHECKPOINT_INTERVAL)
+        if session.dirty:
+            await asyncio.to_thread(session.save_state)
+
+
+async def _download_with_backoff(downloader: GooglePhotosDownloader, item: dict, output_path: Path):
+    """Download an item, backing off while Google answers with HTTP 429."""
+    for attempt in range(RATE_LIMIT_RETRIES):
+        try:
+            return await downloader.download_media_item_async(item, output_path)
+        except RateLimitedError as e:
+            if attempt == RATE_LIMIT_RETRIES - 1 or downloader.cancelled:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, e.retry_after))
+    return False, 0
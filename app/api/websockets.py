@@ -5,16 +5,23 @@ from __future__ import annotations
 
 import json
 import asyncio
+import logging
 from typing import Dict, Set, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 
+logger = logging.getLogger(__name__)
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates."""
     
+    # Minimum seconds between progress messages for one session
+    PROGRESS_INTERVAL = 0.1
+    
     def __init__(self):
         """Initialize connection manager."""
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._last_progress: Dict[str, float] = {}
         
     async def connect(self, websocket: WebSocket, session_id: str):
         """Accept a WebSocket connection and add to session."""
@@ -24,7 +31,7 @@ class ConnectionManager:
             self.active_connections[session_id] = set()
         
         self.active_connections[session_id].add(websocket)
-        print(f"WebSocket connected for session {session_id}")
+        logger.info("WebSocket connected for session %s", session_id)
     
     def disconnect(self, websocket: WebSocket, session_id: str):
         """Remove a WebSocket connection from session."""
@@ -34,16 +41,26 @@ class ConnectionManager:
             # Clean up empty sessions
             if not self.active_connections[session_id]:
                 del self.active_connections[session_id]
+                self._last_progress.pop(session_id, None)
         
-        print(f"WebSocket disconnected for session {session_id}")
+        logger.info("WebSocket disconnected for session %s", session_id)
     
     async def send_progress_update(self, session_id: str, current: int, total: int, 
                                  percentage: float, speed: float, eta: Optional[int], 
                                  status: str = "downloading"):
-        """Send progress update to all connections for a session."""
+        """Send progress update to all connections for a session.
+        
+        Updates are coalesced to at most one per PROGRESS_INTERVAL so fast
+        downloads don't flood the browser; the final update always goes out.
+        """
         if session_id not in self.active_connections:
             return
         
+        now = asyncio.get_running_loop().time()
+        if current < total and now - self._last_progress.get(session_id, 0.0) < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress[session_id] = now
+        
         eta_str = f"{eta//60}m {eta%60}s" if eta else "Calculating..."
         
         message = {
@@ -55,7 +72,7 @@ class ConnectionManager:
             "speed": f"{speed:.1f} MB/s",
             "eta": eta_str,
             "status": status,
-            "timestamp": asyncio.get_event_loop().time()
+            "timestamp": now
         }
         
         await self._broadcast_to_session(session_id, message)
@@ -105,7 +122,7 @@ class ConnectionManager:
             try:
                 await connection.send_text(json.dumps(message))
             except Exception as e:
-                print(f"Error sending message to WebSocket: {e}")
+                logger.warning("Error sending message to WebSocket: %s", e)
                 disconnected.append(connection)
         
         # Clean up disconnected connections
@@ -16,20 +16,23 @@ class ConfigManager:
         """Initialize configuration manager."""
         self.config_file = Path(config_file)
         self.config = self._load_default_config()
+        # Dotted-path index for get(), rebuilt lazily after any change
+        self._flat: Optional[Dict[str, Any]] = None
         
         # Load existing config if available
-        if self.config_file.exists():
-            self.load_config()
+        self.load_config()
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration."""
         return {
             "download": {
                 "max_workers": 5,
+                "connect_timeout": 5,
                 "timeout": 30,
-                "chunk_size": 8192,
+                "write_buffer_size": 262144,
                 "retry_attempts": 3,
                 "retry_delay": 2,
+                "rate_limit": 0,
                 "output_dir": "downloads"
             },
             "api": {
@@ -47,10 +50,13 @@ class ConfigManager:
     def load_config(self) -> None:
         """Load configuration from file."""
         try:
-            with open(self.config_file, 'r') as f:
-                saved_config = json.load(f)
-                # Merge with defaults (keeping any new defaults)
-                self._merge_config(self.config, saved_config)
+            with open(self.config_file, 'rb') as f:
+                saved_config = json.loads(f.read())
+            # Merge with defaults (keeping any new defaults)
+            self._merge_config(self.config, saved_config)
+            self._flat = None
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Warning: Could not load config file: {e}")
     
@@ -70,17 +76,22 @@ class ConfigManager:
             else:
                 base[key] = value
     
+    def _flatten(self, section: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Map every dotted path in a section, sections included, to its value."""
+        flat = {}
+        for key, value in section.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, f"{path}."))
+        return flat
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation."""
-        keys = key.split('.')
-        value = self.config
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        # Called per download, so look paths up in one dict instead of walking sections
+        if self._flat is None:
+            self._flat = self._flatten(self.config)
+        return self._flat.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation."""
@@ -95,6 +106,7 @@ class ConfigManager:
         
         # Set the final value
         config_section[keys[-1]] = value
+        self._flat = None
     
     def get_section(self, section: str) -> Dict[str, Any]:
         """Get entire configuration section."""
@@ -105,4 +117,5 @@ class ConfigManager:
         if section not in self.config:
             self.config[section] = {}
         
-        self.config[section].update(updates)
\ No newline at end of file
+        self.config[section].update(updates)
+        self._flat = None
\ No newline at end of file
@@ -4,15 +4,21 @@ Core Google Photos downloader logic
 from __future__ import annotations
 
 import requests
+import urllib3
 import hashlib
 import time
 import asyncio
 import json
 import logging
-from datetime import datetime
+import os
+import random
+import re
+import threading
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Callable, Tuple
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
 # Google API imports
 try:
@@ -21,6 +27,8 @@ try:
     from google_auth_oauthlib.flow import InstalledAppFlow
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import build_http
+    import google_auth_httplib2
     GOOGLE_APIS_AVAILABLE = True
 except ImportError:
     GOOGLE_APIS_AVAILABLE = False
@@ -33,9 +41,173 @@ except ImportError:
 # Google Photos API scope
 SCOPES = ['https://www.googleapis.com/auth/photoslibrary.readonly']
 
+# Maximum IDs per mediaItems.batchGet request
+BATCH_GET_SIZE = 50
+
+# creationTime as the API sends it (RFC 3339 in UTC), captured as filename timestamp digits
+_UTC_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?Z')
+
+# Month-sized date-range searches paginated at the same time
+SEARCH_CONCURRENCY = 8
+
+# Read size when copying a download stream to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Backoff for transient download failures: base * 2**attempt seconds, capped
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 30.0
+
+# Parsed credentials files keyed by path, valid while (mtime_ns, size) is unchanged
+_credentials_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _load_credentials_file(path: str) -> Tuple[int, Any]:
+    """Return (size, parsed JSON) for a credentials file, None for an empty file.
+    
+    The auth status endpoint is polled by the web UI, so the parse is cached
+    and only redone when the file's mtime or size changes.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _credentials_cache.get(path)
+    if cached and cached[0] == key:
+        return st.st_size, cached[1]
+    
+    data = Path(path).read_bytes()
+    parsed = json.loads(data) if data else None
+    _credentials_cache[path] = (key, parsed)
+    return st.st_size, parsed
+
+
+def _month_ranges(start: date, end: date) -> List[Tuple[date, date]]:
+    """Split an inclusive date range into calendar-month sub-ranges."""
+    ranges = []
+    current = date(start.year, start.month, start.day)
+    end = date(end.year, end.month, end.day)
+    while current <= end:
+        if current.month == 12:
+            next_month = date(current.year + 1, 1, 1)
+        else:
+            next_month = date(current.year, current.month + 1, 1)
+        ranges.append((current, min(end, next_month - timedelta(days=1))))
+        current = next_month
+    return ranges
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Parse a numeric Retry-After header, None if absent or a date."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    return float(value) if value and value.isdigit() else None
+
+
+# Errors a download attempt can end with. Reads from response.raw raise
+# urllib3's own exceptions, which requests doesn't wrap.
+DOWNLOAD_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError, IOError)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a download error is transient and worth another attempt.
+    
+    Connection drops (including mid-body), timeouts, 429 and 5xx responses
+    are retried; other HTTP errors (403 on an expired baseUrl, 404) and local
+    disk errors are not.
+    """
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else 0
+        return status == 429 or status >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout,
+                            requests.exceptions.ChunkedEncodingError,
+                            urllib3.exceptions.ProtocolError,
+                            urllib3.exceptions.ReadTimeoutError,
+                            urllib3.exceptions.IncompleteRead))
+
+
+def ensure_complete_body(response: requests.Response) -> None:
+    """Raise IncompleteRead if fewer bytes arrived than Content-Length announced.
+    
+    urllib3 1.x doesn't enforce Content-Length on streamed reads, so a
+    connection closed early would otherwise look like a finished download.
+    """
+    expected = response.headers.get('Content-Length', '')
+    if expected.isdigit():
+        received = response.raw.tell()
+        if received < int(expected):
+            raise urllib3.exceptions.IncompleteRead(received, int(expected) - received)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with jitter, deferring to the server's Retry-After."""
+    if retry_after is not None:
+        return retry_after
+    return min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt) + random.random() * RETRY_BACKOFF_BASE
+
+
+class RateLimitedError(Exception):
+    """Raised when Google responds with HTTP 429 for a media download."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing requests to ``rate`` per second.
+    
+    Separate from the worker count: workers bound how many downloads are in
+    flight, the bucket bounds how fast new requests start. A rate of 0 means
+    unlimited, but pause() still holds every caller back.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.resume_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self) -> None:
+        """Block until a request may start."""
+        while True:
+            with self._lock:
+                wait = self.resume_at - time.monotonic()
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold off every caller for ``seconds``, e.g. after a 429 Retry-After."""
+        with self._lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+            if self.rate > 0:
+                # Start refilling from an empty bucket once the pause ends, so
+                # waiting workers don't all fire at once
+                self._refill()
+                self.tokens = min(self.tokens, 0.0)
+                self.updated = self.resume_at
+
 
 class DownloadStats:
-    """Track download statistics and calculate speeds/ETA."""
+    """Track download statistics and calculate speeds/ETA.
+    
+    Speed and ETA come from exponential moving averages of the byte and file
+    rates, refreshed at most once per RATE_WINDOW seconds, so they follow the
+    current throughput using only a handful of scalars.
+    """
+    
+    RATE_WINDOW = 1.0
+    SMOOTHING = 0.3
     
     def __init__(self):
         self.start_time = None
@@ -43,6 +215,15 @@ class DownloadStats:
         self.total_files = 0
         self.total_bytes = 0
         self.completed_bytes = 0
+        self._reset_rates()
+        
+    def _reset_rates(self):
+        """Clear the moving-average state."""
+        self._window_start = self.start_time
+        self._window_files = 0
+        self._window_bytes = 0
+        self._bytes_rate = None
+        self._files_rate = None
         
     def start(self, total_files: int):
         """Start tracking download statistics."""
@@ -51,16 +232,38 @@ class DownloadStats:
         self.completed_files = 0
         self.total_bytes = 0
         self.completed_bytes = 0
+        self._reset_rates()
         
     def update(self, file_size: int = 0):
         """Update statistics after completing a file."""
         self.completed_files += 1
         self.completed_bytes += file_size
         
+        if self._window_start is None:
+            return
+        now = time.time()
+        elapsed = now - self._window_start
+        if elapsed < self.RATE_WINDOW:
+            return
+        
+        bytes_rate = (self.completed_bytes - self._window_bytes) / elapsed
+        files_rate = (self.completed_files - self._window_files) / elapsed
+        if self._bytes_rate is None:
+            self._bytes_rate, self._files_rate = bytes_rate, files_rate
+        else:
+            self._bytes_rate += self.SMOOTHING * (bytes_rate - self._bytes_rate)
+            self._files_rate += self.SMOOTHING * (files_rate - self._files_rate)
+        
+        self._window_start = now
+        self._window_bytes = self.completed_bytes
+        self._window_files = self.completed_files
+        
     def get_speed_mbps(self) -> float:
         """Get current download speed in MB/s."""
         if not self.start_time or self.completed_bytes == 0:
             return 0.0
+        if self._bytes_rate is not None:
+            return self._bytes_rate / (1024 * 1024)
         elapsed = time.time() - self.start_time
         return (self.completed_bytes / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0
         
@@ -69,8 +272,11 @@ class DownloadStats:
         if self.completed_files == 0 or self.completed_files >= self.total_files:
             return None
         
-        elapsed = time.time() - self.start_time
-        rate = self.completed_files / elapsed if elapsed > 0 else 0
+        if self._files_rate is not None:
+            rate = self._files_rate
+        else:
+            elapsed = time.time() - self.start_time
+            rate = self.completed_files / elapsed if elapsed > 0 else 0
         remaining_files = self.total_files - self.completed_files
         
         return int(remaining_files / rate) if rate > 0 else None
@@ -79,7 +285,8 @@ class DownloadStats:
 class GooglePhotosDownloader:
     """Core downloader class handling Google Photos API interactions."""
     
-    def __init__(self, credentials_file: str = 'credentials.json', token_file: str = 'token.json', config: ConfigManager = None):
+    def __init__(self, credentials_file: str = 'credentials.json', token_file: str = 'token.json', config: ConfigManager = None,
+                 http_session: Optional[requests.Session] = None):
         """Initialize the Google Photos downloader."""
         self.credentials_file = credentials_file
         self.token_file = token_file
@@ -91,6 +298,33 @@ class GooglePhotosDownloader:
         self.stats = DownloadStats()
         self.current_session = None
         self.config = config or ConfigManager()
+        # File names per output directory, from index_output_dir
+        self._dir_names: Dict[Path, set] = {}
+        # Callers may share their own session; otherwise keep one for our lifetime
+        self._owns_http_session = http_session is None
+        self.http_session = http_session or self._create_http_session()
+        
+        # Media download starts per second; 0 leaves pacing to max_workers
+        self.rate_limiter = TokenBucket(
+            self.config.get('download.rate_limit', 0),
+            burst=self.config.get('download.max_workers', 5)
+        )
+    
+    def _create_http_session(self) -> requests.Session:
+        """Create a keep-alive session pooled for the configured worker count."""
+        max_workers = self.config.get('download.max_workers', 5)
+        session = requests.Session()
+        session.headers['User-Agent'] = 'GooglePhotosDownloader/2.0'
+        # Retries are handled by the download loop itself
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_workers * 2, max_retries=0)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self) -> None:
+        """Close the HTTP session if this downloader created it."""
+        if self._owns_http_session and self.http_session is not None:
+            self.http_session.close()
+            self.http_session = None
         
     def set_callbacks(self, progress_callback: Optional[Callable] = None, 
                      status_callback: Optional[Callable] = None):
@@ -121,22 +355,21 @@ class GooglePhotosDownloader:
         try:
             self.update_status(f"Validating credentials file: {self.credentials_file}")
             
-            credentials_path = Path(self.credentials_file)
-            if not credentials_path.exists():
+            # One stat (and at most one read) covers the existence, size and JSON checks
+            try:
+                file_size, creds_data = _load_credentials_file(self.credentials_file)
+            except FileNotFoundError:
                 self.update_status(f"Error: Credentials file '{self.credentials_file}' not found")
                 return False
             
             # Check file size
-            file_size = credentials_path.stat().st_size
             self.update_status(f"Credentials file size: {file_size} bytes")
             
             if file_size == 0:
                 self.update_status("Error: Credentials file is empty")
                 return False
             
-            # Validate JSON format and required fields
-            with open(self.credentials_file, 'r') as f:
-                creds_data = json.load(f)
+            # Validate required fields
             
             self.update_status("Credentials file JSON format is valid")
             
@@ -253,7 +486,9 @@ class GooglePhotosDownloader:
             # Build the service with error handling
             try:
                 self.update_status("Building Google Photos API service object...")
-                self.service = build('photoslibrary', 'v1', credentials=creds, cache_discovery=False)
+                # The client doesn't bundle a photoslibrary discovery document, so fetch it
+                self.service = build('photoslibrary', 'v1', credentials=creds, cache_discovery=False,
+                                     static_discovery=False)
                 self.update_status("Google Photos API service object created successfully")
             except Exception as e:
                 self.update_status(f"Error building API service: {e}")
@@ -460,26 +695,31 @@ class GooglePhotosDownloader:
             'day': date_obj.day
         }
     
-    async def get_albums_async(self) -> List[Dict[str, Any]]:
-        """Retrieve list of albums from Google Photos."""
+    async def iter_albums_async(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of albums as the API returns them.
+        
+        Each page request runs in a worker thread so callers can show the
+        first albums while later pages are still being fetched.
+        """
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
         
-        self.update_status("Fetching albums...")
-        albums = []
+        found = 0
         page_token = None
         
         try:
             while not self.cancelled:
                 if page_token:
-                    response = self.service.albums().list(pageToken=page_token, pageSize=50).execute()
+                    request = self.service.albums().list(pageToken=page_token, pageSize=50)
                 else:
-                    response = self.service.albums().list(pageSize=50).execute()
+                    request = self.service.albums().list(pageSize=50)
+                response = await asyncio.to_thread(request.execute)
                 
                 if 'albums' in response:
                     batch = response['albums']
-                    albums.extend(batch)
-                    self.update_status(f"Found {len(batch)} albums (total: {len(albums)})")
+                    found += len(batch)
+                    self.update_status(f"Found {len(batch)} albums (total: {found})")
+                    yield batch
                 
                 page_token = response.get('nextPageToken')
                 if not page_token:
@@ -487,20 +727,26 @@ class GooglePhotosDownloader:
                     
         except HttpError as e:
             self.update_status(f"API error fetching albums: {e}")
-            return albums
+    
+    async def get_albums_async(self) -> List[Dict[str, Any]]:
+        """Retrieve list of albums from Google Photos."""
+        self.update_status("Fetching albums...")
+        albums = []
+        async for batch in self.iter_albums_async():
+            albums.extend(batch)
         
         self.update_status(f"Found {len(albums)} albums")
         return albums
     
-    async def get_media_items_async(self, start_date: datetime = None, end_date: datetime = None, 
-                                   album_id: str = None, media_types: List[str] = None) -> List[Dict[str, Any]]:
-        """Retrieve media items from Google Photos with various filters."""
-        if not self.service:
-            raise RuntimeError("Not authenticated. Call authenticate() first.")
-        
-        # If album_id is provided, use album-specific search
+    def _build_search_body(self, start_date: datetime = None, end_date: datetime = None,
+                           album_id: str = None, media_types: List[str] = None) -> Dict[str, Any]:
+        """Build the mediaItems.search request body for an album or a date/media-type filter."""
         if album_id:
-            return await self.get_album_media_items_async(album_id)
+            self.update_status(f"Searching for items in album...")
+            return {
+                'albumId': album_id,
+                'pageSize': 100
+            }
         
         # Build search filters
         filters = {}
@@ -528,33 +774,108 @@ class GooglePhotosDownloader:
                 'mediaTypes': ['PHOTO', 'VIDEO']
             }
         
-        search_body = {
+        return {
             'filters': filters,
             'pageSize': 100
         }
+    
+    async def iter_media_items(self, start_date: datetime = None, end_date: datetime = None,
+                               album_id: str = None, media_types: List[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of media items as the API returns them.
         
-        media_items = []
-        page_token = None
+        Each page request runs in a worker thread, so callers can start
+        downloading one page while the next one is being fetched.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+        
+        search_body = self._build_search_body(start_date, end_date, album_id, media_types)
+        months = _month_ranges(start_date, end_date) if start_date and end_date and not album_id else []
+        if len(months) > 1:
+            pages = self._iter_month_pages(search_body, months)
+        else:
+            pages = self._iter_search_pages(search_body)
+        found = 0
         
         try:
-            while not self.cancelled:
-                if page_token:
-                    search_body['pageToken'] = page_token
-                
-                response = self.service.mediaItems().search(body=search_body).execute()
-                
-                if 'mediaItems' in response:
-                    batch = response['mediaItems']
-                    media_items.extend(batch)
-                    self.update_status(f"Found {len(batch)} items in batch (total: {len(media_items)})")
-                
-                page_token = response.get('nextPageToken')
-                if not page_token:
-                    break
+            async for batch in pages:
+                found += len(batch)
+                self.update_status(f"Found {len(batch)} items in batch (total: {found})")
+                yield batch
                     
         except HttpError as e:
             self.update_status(f"API error during search: {e}")
-            return media_items
+    
+    async def _iter_search_pages(self, search_body: Dict[str, Any],
+                                 http=None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Follow nextPageToken for one search, yielding each non-empty page."""
+        search_body = dict(search_body)
+        while not self.cancelled:
+            request = self.service.mediaItems().search(body=search_body)
+            response = await asyncio.to_thread(request.execute, http=http)
+            
+            if 'mediaItems' in response:
+                yield response['mediaItems']
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+            search_body['pageToken'] = page_token
+    
+    async def _iter_month_pages(self, search_body: Dict[str, Any],
+                                months: List[Tuple[date, date]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Search each month of a date range concurrently, yielding pages as they arrive.
+        
+        Pagination is serial within a search, so a multi-year range is split
+        into month searches taken in turn by up to SEARCH_CONCURRENCY workers.
+        Each worker has its own authorized connection because httplib2
+        connections can't be shared across threads.
+        """
+        pages: asyncio.Queue = asyncio.Queue()
+        pending = iter(months)
+        
+        async def search_months() -> None:
+            try:
+                # One connection per worker, reused for every month it takes;
+                # build_http applies the client's default socket timeout
+                http = google_auth_httplib2.AuthorizedHttp(self.creds, http=build_http())
+                for start, end in pending:
+                    body = dict(search_body)
+                    body['filters'] = dict(
+                        search_body['filters'],
+                        dateFilter={'ranges': [{
+                            'startDate': self.date_to_google_format(start),
+                            'endDate': self.date_to_google_format(end)
+                        }]}
+                    )
+                    async for batch in self._iter_search_pages(body, http):
+                        await pages.put(batch)
+                await pages.put(None)
+            except Exception as e:
+                await pages.put(e)
+        
+        tasks = [asyncio.create_task(search_months())
+                 for _ in range(min(SEARCH_CONCURRENCY, len(months)))]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                batch = await pages.get()
+                if batch is None:
+                    remaining -= 1
+                elif isinstance(batch, Exception):
+                    raise batch
+                else:
+                    yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def get_media_items_async(self, start_date: datetime = None, end_date: datetime = None, 
+                                   album_id: str = None, media_types: List[str] = None) -> List[Dict[str, Any]]:
+        """Retrieve media items from Google Photos with various filters."""
+        media_items = []
+        async for batch in self.iter_media_items(start_date, end_date, album_id, media_types):
+            media_items.extend(batch)
         
         if self.cancelled:
             self.update_status("Search cancelled")
@@ -563,42 +884,47 @@ class GooglePhotosDownloader:
         
         return media_items
     
-    async def get_album_media_items_async(self, album_id: str) -> List[Dict[str, Any]]:
-        """Retrieve media items from a specific album."""
+    async def iter_refreshed_items(self, items: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield items in mediaItems.batchGet-sized pages with fresh baseUrls.
+        
+        Base URLs expire about an hour after they are issued, so items saved in
+        an older session must be refreshed before downloading. Items are
+        updated in place; if a batch can't be refreshed it is yielded as is.
+        """
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
         
-        self.update_status(f"Searching for items in album...")
-        media_items = []
-        page_token = None
-        
-        try:
-            while not self.cancelled:
-                search_body = {
-                    'albumId': album_id,
-                    'pageSize': 100
-                }
-                
-                if page_token:
-                    search_body['pageToken'] = page_token
-                
-                response = self.service.mediaItems().search(body=search_body).execute()
-                
-                if 'mediaItems' in response:
-                    batch = response['mediaItems']
-                    media_items.extend(batch)
-                    self.update_status(f"Found {len(batch)} items in batch (total: {len(media_items)})")
-                
-                page_token = response.get('nextPageToken')
-                if not page_token:
-                    break
-                    
-        except HttpError as e:
-            self.update_status(f"API error during album search: {e}")
-            return media_items
-        
-        self.update_status(f"Album search complete: {len(media_items)} items found")
-        return media_items
+        for start in range(0, len(items), BATCH_GET_SIZE):
+            if self.cancelled:
+                break
+            
+            batch = items[start:start + BATCH_GET_SIZE]
+            request = self.service.mediaItems().batchGet(mediaItemIds=[item['id'] for item in batch])
+            try:
+                response = await asyncio.to_thread(request.execute)
+            except HttpError as e:
+                self.update_status(f"API error refreshing download URLs: {e}")
+                yield batch
+                continue
+            
+            fresh = {
+                result['mediaItem']['id']: result['mediaItem']['baseUrl']
+                for result in response.get('mediaItemResults', [])
+                if 'mediaItem' in result
+            }
+            for item in batch:
+                if item['id'] in fresh:
+                    item['baseUrl'] = fresh[item['id']]
+            yield batch
+    
+    async def refresh_base_urls(self, items: List[Dict[str, Any]]) -> None:
+        """Refresh the baseUrl of every item in place."""
+        async for _ in self.iter_refreshed_items(items):
+            pass
+    
+    async def get_album_media_items_async(self, album_id: str) -> List[Dict[str, Any]]:
+        """Retrieve media items from a specific album."""
+        return await self.get_media_items_async(album_id=album_id)
     
     def _calculate_file_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of a file."""
@@ -613,25 +939,54 @@ class GooglePhotosDownloader:
             return ""
     
     async def download_media_item_async(self, item: Dict[str, Any], output_dir: Path) -> Tuple[bool, int]:
+        """Download a single media item without blocking the event loop."""
+        return await asyncio.to_thread(self.download_media_item, item, output_dir)
+    
+    def index_output_dir(self, output_dir: Path) -> set:
+        """List an output directory once so per-item existence checks are set lookups.
+        
+        Call at the start of a run; names of files downloaded afterwards are
+        added as they complete.
+        """
+        try:
+            with os.scandir(output_dir) as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError:
+            names = set()
+        self._dir_names[output_dir] = names
+        return names
+    
+    @staticmethod
+    def local_filename(item: Dict[str, Any]) -> str:
+        """Name a media item is saved under: creation timestamp plus original filename."""
+        creation_time = item['mediaMetadata']['creationTime']
+        match = _UTC_TIMESTAMP_RE.fullmatch(creation_time)
+        if match:
+            # Already UTC, so the digits can be reordered without parsing a datetime
+            year, month, day, hour, minute, second = match.groups()
+            safe_timestamp = f"{year}{month}{day}_{hour}{minute}{second}"
+        else:
+            timestamp = datetime.fromisoformat(creation_time.replace('Z', '+00:00'))
+            safe_timestamp = timestamp.strftime('%Y%m%d_%H%M%S')
+        
+        # Use pathlib for file extension handling
+        file_path_obj = Path(item['filename'])
+        return f"{safe_timestamp}_{file_path_obj.stem}{file_path_obj.suffix}"
+    
+    def download_media_item(self, item: Dict[str, Any], output_dir: Path) -> Tuple[bool, int]:
         """Download a single media item with checksum-based duplicate detection."""
         try:
             filename = item['filename']
             media_metadata = item['mediaMetadata']
             
             # Create safe filename with timestamp
-            creation_time = media_metadata['creationTime']
-            timestamp = datetime.fromisoformat(creation_time.replace('Z', '+00:00'))
-            safe_timestamp = timestamp.strftime('%Y%m%d_%H%M%S')
-            
-            # Use pathlib for file extension handling
-            file_path_obj = Path(filename)
-            name = file_path_obj.stem
-            ext = file_path_obj.suffix
-            safe_filename = f"{safe_timestamp}_{name}{ext}"
+            safe_filename = self.local_filename(item)
             file_path = output_dir / safe_filename
             
             # Skip if exact file already exists
-            if file_path.exists():
+            names = self._dir_names.get(output_dir)
+            exists = safe_filename in names if names is not None else file_path.exists()
+            if exists:
                 existing_size = file_path.stat().st_size
                 self.update_status(f"Skipping existing file: {safe_filename}")
                 return True, existing_size
@@ -645,6 +1000,15 @@ class GooglePhotosDownloader:
                 self.update_status(f"Unknown media type for {filename}")
                 return False, 0
             
+            # (connect, read): fail fast on unreachable hosts, stay patient mid-transfer
+            timeout = (
+                self.config.get('download.connect_timeout', 5),
+                self.config.get('download.timeout', 30)
+            )
+            buffer_size = self.config.get('download.write_buffer_size', 262144)
+            temp_file = file_path.with_suffix(f"{file_path.suffix}.tmp")
+            file_size = 0
+            
             # Download with retry logic
             max_retries = 3
             for attempt in range(max_retries):
@@ -652,45 +1016,57 @@ class GooglePhotosDownloader:
                     return False, 0
                     
                 try:
-                    timeout = self.config.get('download.timeout', 30)
-                    chunk_size = self.config.get('download.chunk_size', 8192)
-                    
-                    response = requests.get(download_url, stream=True, timeout=timeout)
+                    # Uncompressed, so Range offsets match the bytes already on disk;
+                    # after a dropped transfer, ask only for the bytes we don't have yet
+                    headers = {'Accept-Encoding': 'identity'}
+                    if file_size:
+                        headers['Range'] = f'bytes={file_size}-'
+                    self.rate_limiter.acquire()
+                    response = self.http_session.get(download_url, stream=True, timeout=timeout, headers=headers)
+                    if response.status_code == 429:
+                        retry_after = retry_after_seconds(response)
+                        response.close()
+                        # Slow every worker down, not just this one
+                        self.rate_limiter.pause(retry_after or 1.0)
+                        raise RateLimitedError(f"Rate limited while downloading {filename}", retry_after)
                     response.raise_for_status()
+                    if response.status_code != 206:
+                        # Full body (first attempt, or the server ignored Range)
+                        file_size = 0
                     
-                    # Get content length for progress tracking
-                    content_length = response.headers.get('content-length')
-                    total_size = int(content_length) if content_length else None
-                    
-                    # Create temporary file first
-                    temp_file = file_path.with_suffix(f"{file_path.suffix}.tmp")
-                    file_size = 0
-                    
-                    # Use larger buffer for big files (>50MB)
-                    if total_size and total_size > 50 * 1024 * 1024:
-                        chunk_size = min(chunk_size * 16, 128 * 1024)  # Up to 128KB chunks
-                    
-                    with open(temp_file, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=chunk_size):
+                    # Stream straight from urllib3 in 1 MiB blocks rather than
+                    # through iter_content's extra generator layer
+                    with open(temp_file, 'ab' if file_size else 'wb', buffering=buffer_size) as f:
+                        for chunk in response.raw.stream(COPY_CHUNK_SIZE, decode_content=True):
                             if self.cancelled:
                                 f.close()
                                 temp_file.unlink(missing_ok=True)
                                 return False, 0
                             f.write(chunk)
                             file_size += len(chunk)
+                    ensure_complete_body(response)
                     
                     # Move temp file to final location
                     temp_file.rename(file_path)
+                    if names is not None:
+                        names.add(safe_filename)
                     return True, file_size
                     
-                except (requests.RequestException, IOError) as e:
+                except DOWNLOAD_ERRORS as e:
+                    if not is_retryable(e):
+                        self.update_status(f"Failed to download {filename}: {e}")
+                        temp_file.unlink(missing_ok=True)
+                        return False, 0
                     if attempt < max_retries - 1:
                         self.update_status(f"Retry {attempt + 1}/{max_retries} for {filename}: {e}")
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        time.sleep(backoff_delay(attempt, retry_after_seconds(getattr(e, 'response', None))))
                     else:
                         self.update_status(f"Failed to download {filename} after {max_retries} attempts: {e}")
+                        temp_file.unlink(missing_ok=True)
                         return False, 0
             
+        except RateLimitedError:
+            raise
         except Exception as e:
             self.update_status(f"Unexpected error downloading {item.get('filename', 'unknown')}: {e}")
             return False, 0
@@ -737,8 +1113,9 @@ class GooglePhotosDownloader:
             
             # Validate credentials file format
             try:
-                with open(self.credentials_file, 'r') as f:
-                    creds_data = json.load(f)
+                _, creds_data = _load_credentials_file(self.credentials_file)
+                if creds_data is None:
+                    raise json.JSONDecodeError("Empty file", "", 0)
                 
                 if 'installed' not in creds_data and 'web' not in creds_data:
                     status.update({
@@ -786,7 +1163,11 @@ class GooglePhotosDownloader:
                     if creds and creds.valid:
                         # Test the service
                         try:
-                            service = build('photoslibrary', 'v1', credentials=creds, cache_discovery=False)
+                            # The status endpoint is polled; reuse the authenticated service if we have one
+                            service = self.service if self.creds is not None and self.creds.valid else None
+                            if service is None:
+                                service = build('photoslibrary', 'v1', credentials=creds, cache_discovery=False,
+                                                static_discovery=False)
                             test_response = service.albums().list(pageSize=1).execute()
                             
                             status.update({
@@ -3,13 +3,70 @@ Download session management for tracking progress and state.
 """
 from __future__ import annotations
 
+import atexit
+import base64
 import json
+import logging
 import uuid
 import os
+import shutil
+import threading
+import weakref
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SESSIONS_DIR = "sessions"
+SUMMARY_FIELDS = (
+    'session_id', 'created_at', 'last_updated', 'total_items',
+    'completed_items', 'failed_items', 'output_dir', 'download_params'
+)
+PROGRESS_BUFFER_SIZE = 64 * 1024
+# Completions between progress log flushes during a download
+PROGRESS_FLUSH_EVERY = 100
+
+logger = logging.getLogger(__name__)
+
+# Sessions holding an open progress log, closed at interpreter exit
+_open_sessions = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_sessions() -> None:
+    """Flush and close progress logs of sessions still alive at exit."""
+    for session in list(_open_sessions):
+        session.close()
+
+
+def _read_state_file(path: str) -> Dict[str, Any]:
+    """Read and decode a state.json file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _write_state_file(path: str, state: Dict[str, Any]) -> None:
+    """Serialize state in one buffer and replace the file atomically."""
+    if orjson:
+        data = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(state, indent=2).encode('utf-8')
+    
+    temp_path = path + ".tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(temp_path, path)
+
 
 class DownloadSession:
     """Manages download session state and persistence."""
@@ -25,14 +82,133 @@ class DownloadSession:
         self.output_dir = ""
         self.download_params = {}
         self.media_items = []
-        self.completed_item_ids = set()
-        self.failed_item_ids = set()
-        self.session_dir = Path("sessions") / self.session_id
-        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.session_dir = os.path.join(SESSIONS_DIR, self.session_id)
+        self._progress_file = None
+        self._lock = threading.Lock()
+        self.dirty = False
+        os.makedirs(self.session_dir, exist_ok=True)
+    
+    @property
+    def media_items(self) -> List[Dict[str, Any]]:
+        """Media items tracked by this session."""
+        return self._media_items
+    
+    @media_items.setter
+    def media_items(self, items: List[Dict[str, Any]]) -> None:
+        """Set media items and reset the per-item completed/failed bitsets."""
+        self._media_items = items
+        self._item_index = {item['id']: i for i, item in enumerate(items)}
+        self._completed_bits = bytearray((len(items) + 7) // 8)
+        self._failed_bits = bytearray((len(items) + 7) // 8)
+        self.completed_items = 0
+        self.failed_items = 0
+    
+    def add_media_items(self, items: List[Dict[str, Any]]) -> None:
+        """Append newly discovered media items, growing the bitsets to match."""
+        with self._lock:
+            start = len(self._media_items)
+            self._media_items.extend(items)
+            for index, item in enumerate(items, start):
+                self._item_index[item['id']] = index
+            
+            size = (len(self._media_items) + 7) // 8
+            self._completed_bits.extend(bytes(size - len(self._completed_bits)))
+            self._failed_bits.extend(bytes(size - len(self._failed_bits)))
+            self.total_items = len(self._media_items)
+            self.dirty = True
+    
+    @property
+    def completed_item_ids(self) -> set:
+        """IDs of items marked as completed."""
+        return self._ids_from_bits(self._completed_bits)
+    
+    @property
+    def failed_item_ids(self) -> set:
+        """IDs of items marked as failed."""
+        return self._ids_from_bits(self._failed_bits)
+    
+    def _ids_from_bits(self, bits: bytearray) -> set:
+        """Collect the item IDs whose bit is set."""
+        return {
+            item['id'] for i, item in enumerate(self._media_items)
+            if bits[i >> 3] & (1 << (i & 7))
+        }
+    
+    def _set_bit(self, bits: bytearray, item_id: str) -> bool:
+        """Set the bit for an item, returning True if it was not already set."""
+        index = self._item_index.get(item_id)
+        if index is None:
+            return False
+        mask = 1 << (index & 7)
+        if bits[index >> 3] & mask:
+            return False
+        bits[index >> 3] |= mask
+        return True
+    
+    def _load_bits(self, state: Dict[str, Any], key: str, legacy_key: str) -> bytearray:
+        """Restore a bitset from state, accepting the older list-of-IDs format."""
+        bits = bytearray((len(self._media_items) + 7) // 8)
+        if key in state:
+            encoded = base64.b64decode(state[key])
+            bits[:len(encoded)] = encoded[:len(bits)]
+        else:
+            for item_id in state.get(legacy_key, []):
+                self._set_bit(bits, item_id)
+        return bits
+    
+    def _log_progress(self, record: bytes) -> None:
+        """Append a progress record to the session's buffered progress log."""
+        if self._progress_file is None:
+            self._progress_file = open(
+                os.path.join(self.session_dir, "progress.log"), 'ab',
+                buffering=PROGRESS_BUFFER_SIZE
+            )
+            _open_sessions.add(self)
+        self._progress_file.write(record)
+    
+    def _replay_progress(self) -> None:
+        """Apply progress records written since the last state checkpoint."""
+        try:
+            with open(os.path.join(self.session_dir, "progress.log"), 'rb') as f:
+                for line in f:
+                    kind, _, item_id = line.rstrip(b'\n').partition(b'\t')
+                    if kind == b'C':
+                        self._set_bit(self._completed_bits, item_id.decode())
+                    elif kind == b'F':
+                        self._set_bit(self._failed_bits, item_id.decode())
+        except FileNotFoundError:
+            pass
+    
+    def flush_progress(self) -> None:
+        """Force buffered progress records to disk without rewriting state.json.
+        
+        Costs only the records added since the last flush, so it can run far
+        more often than save_state on large sessions.
+        """
+        with self._lock:
+            if self._progress_file is not None:
+                self._progress_file.flush()
+                os.fsync(self._progress_file.fileno())
+    
+    def close(self) -> None:
+        """Flush and close the progress log."""
+        if self._progress_file is not None:
+            self._progress_file.close()
+            self._progress_file = None
+            _open_sessions.discard(self)
     
     def save_state(self) -> None:
-        """Save session state to disk."""
+        """Save session state to disk.
+        
+        Safe to call from a worker thread while items are being marked.
+        """
+        with self._lock:
+            self._save_state_locked()
+    
+    def _save_state_locked(self) -> None:
+        """Write state.json atomically; the caller must hold the session lock."""
         self.last_updated = datetime.now()
+        self.dirty = False
         
         state = {
             'session_id': self.session_id,
@@ -44,64 +220,75 @@ class DownloadSession:
             'output_dir': self.output_dir,
             'download_params': self.download_params,
             'media_items': self.media_items,
-            'completed_item_ids': list(self.completed_item_ids),
-            'failed_item_ids': list(self.failed_item_ids)
+            'completed_bits': base64.b64encode(self._completed_bits).decode('ascii'),
+            'failed_bits': base64.b64encode(self._failed_bits).decode('ascii')
         }
         
-        state_file = self.session_dir / "state.json"
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        _write_state_file(os.path.join(self.session_dir, "state.json"), state)
+        # Small summary so list_sessions doesn't have to parse media_items
+        _write_state_file(
+            os.path.join(self.session_dir, "meta.json"),
+            {key: state[key] for key in SUMMARY_FIELDS}
+        )
+        
+        # state.json now covers everything in the progress log
+        if self._progress_file is not None:
+            self._progress_file.flush()
+            self._progress_file.truncate(0)
     
     @classmethod
     def load_state(cls, session_id: str) -> Optional['DownloadSession']:
         """Load session state from disk."""
-        session_dir = Path("sessions") / session_id
-        state_file = session_dir / "state.json"
+        state_file = os.path.join(SESSIONS_DIR, session_id, "state.json")
         
-        if not state_file.exists():
+        if not os.path.isfile(state_file):
             return None
         
         try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
+            state = _read_state_file(state_file)
             
             session = cls(session_id)
             session.created_at = datetime.fromisoformat(state['created_at'])
             session.last_updated = datetime.fromisoformat(state['last_updated'])
-            session.total_items = state['total_items']
-            session.completed_items = state['completed_items']
-            session.failed_items = state.get('failed_items', 0)
             session.output_dir = state['output_dir']
             session.download_params = state['download_params']
             session.media_items = state['media_items']
             session.total_items = len(session.media_items)
-            session.completed_item_ids = set(state['completed_item_ids'])
-            session.failed_item_ids = set(state.get('failed_item_ids', []))
+            session._completed_bits = session._load_bits(state, 'completed_bits', 'completed_item_ids')
+            session._failed_bits = session._load_bits(state, 'failed_bits', 'failed_item_ids')
+            session._replay_progress()
+            session.completed_items = sum(bin(b).count('1') for b in session._completed_bits)
+            session.failed_items = sum(bin(b).count('1') for b in session._failed_bits)
             
             return session
             
         except Exception as e:
-            print(f"Error loading session {session_id}: {e}")
+            logger.warning("Error loading session %s: %s", session_id, e)
             return None
     
     @classmethod
     def list_sessions(cls) -> List[Dict[str, Any]]:
-        """List all available sessions."""
-        sessions_dir = Path("sessions")
-        if not sessions_dir.exists():
+        """List summaries of all available sessions."""
+        if not os.path.isdir(SESSIONS_DIR):
             return []
         
         sessions = []
-        for session_dir in sessions_dir.iterdir():
-            if session_dir.is_dir():
-                state_file = session_dir / "state.json"
-                if state_file.exists():
+        with os.scandir(SESSIONS_DIR) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                # Missing files surface as OSError, so no separate exists() checks
+                try:
+                    sessions.append(_read_state_file(os.path.join(entry.path, "meta.json")))
+                except FileNotFoundError:
+                    # Sessions saved before meta.json existed
                     try:
-                        with open(state_file, 'r') as f:
-                            state = json.load(f)
-                        sessions.append(state)
+                        state = _read_state_file(os.path.join(entry.path, "state.json"))
                     except Exception:
                         continue
+                    sessions.append({key: state.get(key) for key in SUMMARY_FIELDS})
+                except Exception:
+                    continue
         
         # Sort by last updated (newest first)
         sessions.sort(key=lambda x: x.get('last_updated', ''), reverse=True)
@@ -109,27 +296,44 @@ class DownloadSession:
     
     def mark_completed(self, item_id: str) -> None:
         """Mark an item as completed."""
-        self.completed_item_ids.add(item_id)
-        self.completed_items = len(self.completed_item_ids)
+        with self._lock:
+            if self._set_bit(self._completed_bits, item_id):
+                self.completed_items += 1
+                self.dirty = True
+                self._log_progress(b'C\t' + item_id.encode() + b'\n')
     
     def mark_failed(self, item_id: str) -> None:
         """Mark an item as failed."""
-        self.failed_item_ids.add(item_id)
-        self.failed_items = len(self.failed_item_ids)
+        with self._lock:
+            if self._set_bit(self._failed_bits, item_id):
+                self.failed_items += 1
+                self.dirty = True
+                self._log_progress(b'F\t' + item_id.encode() + b'\n')
     
     def get_remaining_items(self) -> List[Dict[str, Any]]:
         """Get list of items not yet downloaded."""
         if not self.media_items:
             return []
         
-        completed_and_failed = self.completed_item_ids.union(self.failed_item_ids)
+        done = bytes(c | f for c, f in zip(self._completed_bits, self._failed_bits))
         return [
-            item for item in self.media_items 
-            if item['id'] not in completed_and_failed
+            item for i, item in enumerate(self.media_items)
+            if not done[i >> 3] & (1 << (i & 7))
         ]
     
     def cleanup(self) -> None:
         """Clean up session files."""
-        import shutil
-        if self.session_dir.exists():
-            shutil.rmtree(self.session_dir)
\ No newline at end of file
+        self.close()
+        # Session dirs only hold flat files, so unlink them directly and
+        # fall back to rmtree if anything nested shows up
+        try:
+            with os.scandir(self.session_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        raise IsADirectoryError(entry.path)
+                    os.unlink(entry.path)
+            os.rmdir(self.session_dir)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            shutil.rmtree(self.session_dir, ignore_errors=True)
\ No newline at end of file
@@ -2,18 +2,24 @@
 FastAPI application for Google Photos Downloader
 """
 import asyncio
+import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Tuple
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 try:
+    from app.api import routes
     from app.api.routes import router
     from app.api.websockets import ConnectionManager
     from app.core.config import ConfigManager
 except ImportError:
+    from api import routes
     from api.routes import router
     from api.websockets import ConnectionManager
     from core.config import ConfigManager
@@ -21,30 +27,58 @@ except ImportError:
 # Global instances
 config = ConfigManager()
 connection_manager = ConnectionManager()
+logger = logging.getLogger(__name__)
+
+
+def _configured_log_level() -> int:
+    """app.log_level as a logging level, accepting any case and falling back to INFO."""
+    level = config.get('app.log_level', 'INFO')
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    if isinstance(resolved, int):
+        return resolved
+    logger.warning("Unknown app.log_level %r, using INFO", level)
+    return logging.INFO
+
+
+def _start_log_listener() -> Tuple[QueueListener, QueueHandler]:
+    """Route application logging through a queue so handlers write off the event loop.
+    
+    Returns the listener and the root handler feeding it; both are undone on shutdown.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(_configured_log_level())
+    
+    listener.start()
+    return listener, queue_handler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
+    log_listener, log_handler = _start_log_listener()
     print("🚀 Starting Google Photos Downloader Web App...")
     
-    # Verify static files directory exists
-    if not static_path.exists():
-        print(f"⚠️  Warning: Static files directory not found at {static_path}")
-        print("Creating static directory...")
-        static_path.mkdir(parents=True, exist_ok=True)
-    
-    # Verify configuration can be loaded
-    try:
-        config.load_config()
-        print("✅ Configuration loaded successfully")
-    except Exception as e:
-        print(f"⚠️  Warning: Configuration loading issue: {e}")
+    # Configuration was already read once when ConfigManager was created
+    print(f"✅ Configuration loaded from {config.config_file}")
     
     yield
     # Shutdown
     print("🛑 Shutting down Google Photos Downloader Web App...")
+    if routes.downloader is not None:
+        routes.downloader.close()
+    # Records logged after this would queue up with nothing left to write them
+    logging.getLogger().removeHandler(log_handler)
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -66,6 +100,16 @@ app.add_middleware(
 
 # Mount static files - Using pathlib for cross-platform compatibility
 static_path = Path(__file__).parent.parent / "static"
+
+# StaticFiles refuses a missing directory, so make sure it exists before mounting;
+# a single mkdir doubles as the existence check
+try:
+    static_path.mkdir(parents=True)
+except FileExistsError:
+    pass
+else:
+    print(f"⚠️  Warning: Static files directory not found, created {static_path}")
+
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
 # Include API routes
@@ -78,8 +122,9 @@ async def read_root():
     html_path = static_path / "index.html"
     
     try:
-        with open(html_path, "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
+        # Read off the event loop so other requests aren't blocked on disk I/O
+        content = await asyncio.to_thread(html_path.read_text, encoding="utf-8")
+        return HTMLResponse(content=content)
     except FileNotFoundError:
         return HTMLResponse(
             content=f"<h1>Error: index.html not found</h1><p>Expected at: {html_path}</p>",
@@ -105,7 +150,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     except WebSocketDisconnect:
         connection_manager.disconnect(websocket, session_id)
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
         connection_manager.disconnect(websocket, session_id)
 
 
@@ -128,7 +173,7 @@ if __name__ == "__main__":
             "app.main:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,
+            reload="--dev" in sys.argv or "--reload" in sys.argv,
             log_level="info"
         )
     except KeyboardInterrupt:
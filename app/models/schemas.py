@@ -4,7 +4,7 @@ Pydantic models for API requests and responses.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -29,7 +29,7 @@ class DownloadRequest(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     album_id: Optional[str] = None
-    media_types: List[MediaType] = [MediaType.PHOTO, MediaType.VIDEO]
+    media_types: Tuple[MediaType, ...] = (MediaType.PHOTO, MediaType.VIDEO)
     output_dir: str = Field(..., description="Output directory path")
     max_concurrent: int = Field(default=5, ge=1, le=20)
 
@@ -90,4 +90,4 @@ class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
     details: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=datetime.now)
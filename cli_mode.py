@@ -6,15 +6,16 @@ import os
 import sys
 import argparse
 import asyncio
+import random
+import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
-
-# Add current directory to path for imports
-sys.path.insert(0, os.getcwd())
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+# The downloader (and the Google API client behind it) is imported lazily in
+# CLIDownloader.authenticate so --help and --list-sessions start instantly.
 try:
-    from app.core.downloader import GooglePhotosDownloader
     from app.core.config import ConfigManager
     from app.core.session import DownloadSession
 except ImportError as e:
@@ -26,11 +27,30 @@ except ImportError as e:
 class CLIDownloader:
     """Command-line interface for Google Photos Downloader."""
     
-    def __init__(self):
+    def __init__(self, concurrency: Optional[int] = None, write_buffer_size: Optional[int] = None):
         """Initialize CLI downloader."""
         self.config = ConfigManager()
+        if write_buffer_size:
+            self.config.set('download.write_buffer_size', write_buffer_size)
+        if concurrency:
+            # Also sizes the downloader's connection pool and rate-limit burst
+            self.config.set('download.max_workers', concurrency)
         self.downloader = None
         self.session = None
+        self.concurrency = self.config.get('download.max_workers', 5)
+        self.max_rate_limit_retries = 5
+        self.checkpoint_interval = 5.0
+        self.progress_interval = 0.1
+        self._last_progress_print = 0.0
+    
+    async def __aenter__(self) -> 'CLIDownloader':
+        """Enter the CLI run; the downloader and its HTTP session are created on authentication."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the HTTP session shared by every download in this run."""
+        if self.downloader:
+            self.downloader.close()
     
     def print_header(self):
         """Print application header."""
@@ -43,7 +63,11 @@ class CLIDownloader:
         print("=" * 60 + "\n")
     
     def authenticate(self) -> bool:
-        """Authenticate with Google Photos API."""
+        """Authenticate with Google Photos API.
+        
+        Blocking (OAuth flow, token refresh, service discovery); run it via
+        asyncio.to_thread from async code. Safe to call again to re-authenticate.
+        """
         print("🔐 Authenticating with Google Photos API...")
         
         if not os.path.exists("credentials.json"):
@@ -52,13 +76,30 @@ class CLIDownloader:
             print("📖 See OAUTH_GUIDE.md for detailed instructions")
             return False
         
+        try:
+            from app.core.downloader import GooglePhotosDownloader
+        except ImportError as e:
+            print(f"❌ Import error: {e}")
+            print("📦 Please install dependencies: pip install -r requirements-web.txt")
+            return False
+        
+        # Re-authenticating replaces the downloader; release its connections first
+        if self.downloader is not None:
+            self.downloader.close()
         self.downloader = GooglePhotosDownloader(config=self.config)
         
         # Set up CLI callbacks
         def progress_callback(current, total, percentage, speed, eta):
+            # Redraw at most every progress_interval seconds, but always show the last item
+            now = time.monotonic()
+            if current < total and now - self._last_progress_print < self.progress_interval:
+                return
+            self._last_progress_print = now
+            
             eta_str = f"{eta//60}m {eta%60}s" if eta else "Calculating..."
-            print(f"\r📥 Progress: {current}/{total} ({percentage:.1f}%) "
-                  f"Speed: {speed:.1f} MB/s ETA: {eta_str}", end="", flush=True)
+            sys.stdout.write(f"\r📥 Progress: {current}/{total} ({percentage:.1f}%) "
+                             f"Speed: {speed:.1f} MB/s ETA: {eta_str}")
+            sys.stdout.flush()
         
         def status_callback(message):
             print(f"\n📢 {message}")
@@ -76,31 +117,36 @@ class CLIDownloader:
         """List all available albums."""
         print("📂 Fetching albums...")
         
+        count = 0
         try:
-            albums = await self.downloader.get_albums_async()
-            
-            if not albums:
-                print("📭 No albums found")
-                return True
-            
-            print(f"\n📚 Found {len(albums)} albums:")
-            print("-" * 60)
-            
-            for i, album in enumerate(albums, 1):
-                title = album.get('title', 'Untitled')
-                count = album.get('mediaItemsCount', 0)
-                album_id = album['id']
+            async for albums in self.downloader.iter_albums_async():
+                if not count:
+                    print("\n📚 Albums:")
+                    print("-" * 60)
                 
-                print(f"{i:3d}. {title}")
-                print(f"     📸 {count} items")
-                print(f"     🆔 {album_id}")
-                print()
-            
-            return True
+                for album in albums:
+                    count += 1
+                    title = album.get('title', 'Untitled')
+                    items = album.get('mediaItemsCount', 0)
+                    album_id = album['id']
+                    
+                    print(f"{count:3d}. {title}")
+                    print(f"     📸 {items} items")
+                    print(f"     🆔 {album_id}")
+                    print()
             
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print(f"\n⏹️  Listing interrupted after {count} albums")
+            return False
         except Exception as e:
             print(f"❌ Error fetching albums: {e}")
             return False
+        
+        if not count:
+            print("📭 No albums found")
+        else:
+            print(f"📚 Found {count} albums")
+        return True
     
     async def download_by_date_range(self, start_date: datetime, end_date: datetime, 
                                    output_dir: str, media_types: List[str]) -> bool:
@@ -119,71 +165,28 @@ class CLIDownloader:
                 'media_types': media_types
             }
             
-            # Get media items
+            # Create output directory
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+            
+            # Downloads start as soon as the first page of search results arrives
             print("\n🔍 Searching for media items...")
-            media_items = await self.downloader.get_media_items_async(
+            print(f"📥 Downloading to {output_path}")
+            print("⏹️  Press Ctrl+C to cancel\n")
+            
+            pages = self.downloader.iter_media_items(
                 start_date=start_date,
                 end_date=end_date,
                 media_types=media_types
             )
+            success_count, failed_count = await self._download_items(
+                self._track_pages(pages, self.session), output_path, self.session
+            )
             
-            if not media_items:
+            if self.session.total_items == 0:
                 print("📭 No media items found for the specified criteria")
                 return True
             
-            print(f"✅ Found {len(media_items)} items to download")
-            
-            # Setup session
-            self.session.media_items = media_items
-            self.session.total_items = len(media_items)
-            self.session.save_state()
-            
-            # Start download
-            self.downloader.stats.start(len(media_items))
-            
-            # Create output directory
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            print(f"\n📥 Starting download to {output_path}")
-            print("⏹️  Press Ctrl+C to cancel\n")
-            
-            success_count = 0
-            failed_count = 0
-            
-            for i, item in enumerate(media_items, 1):
-                if self.downloader.cancelled:
-                    break
-                
-                try:
-                    success, file_size = await self.downloader.download_media_item_async(
-                        item, output_path
-                    )
-                    
-                    if success:
-                        success_count += 1
-                        self.session.mark_completed(item['id'])
-                    else:
-                        failed_count += 1
-                        self.session.mark_failed(item['id'])
-                    
-                    # Update progress
-                    percentage = (i / len(media_items)) * 100
-                    self.downloader.stats.update(file_size)
-                    
-                    # Save state periodically
-                    if i % 10 == 0:
-                        self.session.save_state()
-                
-                except KeyboardInterrupt:
-                    print("\n\n⏹️  Download cancelled by user")
-                    self.downloader.cancelled = True
-                    break
-                except Exception as e:
-                    print(f"\n❌ Error downloading {item.get('filename', 'unknown')}: {e}")
-                    failed_count += 1
-                    self.session.mark_failed(item['id'])
-            
             # Final status
             self.session.save_state()
             print(f"\n\n📊 Download Summary:")
@@ -192,13 +195,16 @@ class CLIDownloader:
                 print(f"❌ Failed downloads: {failed_count} items")
             print(f"📁 Files saved to: {output_path}")
             
-            # Cleanup if fully completed
-            if failed_count == 0 and success_count > 0:
+            # Cleanup only if every item was downloaded
+            if failed_count == 0 and self.session.completed_items == self.session.total_items:
                 self.session.cleanup()
                 print("🧹 Session cleaned up (fully completed)")
             
             return success_count > 0
             
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self._save_cancelled_session(self.session)
+            raise
         except Exception as e:
             print(f"❌ Download error: {e}")
             return False
@@ -209,62 +215,28 @@ class CLIDownloader:
         print(f"📁 Output directory: {output_dir}")
         
         try:
-            # Get media items from album
-            print("\n🔍 Fetching album contents...")
-            media_items = await self.downloader.get_album_media_items_async(album_id)
-            
-            if not media_items:
-                print("📭 No media items found in this album")
-                return True
-            
-            print(f"✅ Found {len(media_items)} items to download")
-            
             # Setup session
             self.session = DownloadSession()
             self.session.output_dir = output_dir
-            self.session.media_items = media_items
-            self.session.total_items = len(media_items)
             self.session.download_params = {'album_id': album_id}
-            self.session.save_state()
             
             # Create output directory with album name
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
             
-            print(f"\n📥 Starting download to {output_path}")
+            # Downloads start as soon as the first page of album contents arrives
+            print("\n🔍 Fetching album contents...")
+            print(f"📥 Downloading to {output_path}")
             print("⏹️  Press Ctrl+C to cancel\n")
             
-            success_count = 0
-            failed_count = 0
+            pages = self.downloader.iter_media_items(album_id=album_id)
+            success_count, failed_count = await self._download_items(
+                self._track_pages(pages, self.session), output_path, self.session
+            )
             
-            for i, item in enumerate(media_items, 1):
-                if self.downloader.cancelled:
-                    break
-                
-                try:
-                    success, file_size = await self.downloader.download_media_item_async(
-                        item, output_path
-                    )
-                    
-                    if success:
-                        success_count += 1
-                        self.session.mark_completed(item['id'])
-                    else:
-                        failed_count += 1
-                        self.session.mark_failed(item['id'])
-                    
-                    # Save state periodically
-                    if i % 10 == 0:
-                        self.session.save_state()
-                
-                except KeyboardInterrupt:
-                    print("\n\n⏹️  Download cancelled by user")
-                    self.downloader.cancelled = True
-                    break
-                except Exception as e:
-                    print(f"\n❌ Error downloading {item.get('filename', 'unknown')}: {e}")
-                    failed_count += 1
-                    self.session.mark_failed(item['id'])
+            if self.session.total_items == 0:
+                print("📭 No media items found in this album")
+                return True
             
             # Final status
             self.session.save_state()
@@ -276,10 +248,122 @@ class CLIDownloader:
             
             return success_count > 0
             
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self._save_cancelled_session(self.session)
+            raise
         except Exception as e:
             print(f"❌ Download error: {e}")
             return False
     
+    def _save_cancelled_session(self, session: DownloadSession) -> None:
+        """Keep an interrupted session on disk so it can be resumed."""
+        session.save_state()
+        print(f"💾 Progress saved. Resume with: python cli_mode.py --resume {session.session_id}")
+    
+    async def _download_with_backoff(self, item: Dict[str, Any], output_path: Path) -> Tuple[bool, int]:
+        """Download an item, backing off exponentially while Google answers with HTTP 429."""
+        from app.core.downloader import RateLimitedError
+        
+        for attempt in range(self.max_rate_limit_retries):
+            try:
+                return await self.downloader.download_media_item_async(item, output_path)
+            except RateLimitedError as e:
+                if attempt == self.max_rate_limit_retries - 1 or self.downloader.cancelled:
+                    raise
+                delay = e.retry_after or min(2 ** attempt, 60) + random.random()
+                await asyncio.sleep(delay)
+        return False, 0
+    
+    async def _track_pages(self, pages: AsyncIterator[List[Dict[str, Any]]],
+                           session: DownloadSession) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Register each page of search results on the session before it is downloaded."""
+        saved = False
+        async for batch in pages:
+            session.add_media_items(batch)
+            if not saved:
+                # Resumable from the first page on, not only after the first checkpoint
+                await asyncio.to_thread(session.save_state)
+                saved = True
+            yield batch
+    
+    async def _download_items(self, pages: AsyncIterator[List[Dict[str, Any]]], output_path: Path,
+                              session: DownloadSession) -> Tuple[int, int]:
+        """Download items as pages arrive, recording each result on the session as it finishes.
+        
+        A producer feeds items from ``pages`` into a bounded queue while
+        ``concurrency`` workers download them, so fetching the next page of
+        search results overlaps with downloading the current one.
+        """
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        counts = {'success': 0, 'failed': 0, 'done': 0, 'queued': 0}
+        self.downloader.stats.start(0)
+        self.downloader.index_output_dir(output_path)
+        
+        async def produce():
+            try:
+                async for batch in pages:
+                    counts['queued'] += len(batch)
+                    self.downloader.stats.total_files = counts['queued']
+                    for item in batch:
+                        await queue.put(item)
+            finally:
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+        
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if self.downloader.cancelled:
+                    continue
+                
+                try:
+                    success, file_size = await self._download_with_backoff(item, output_path)
+                except Exception as e:
+                    print(f"\n❌ Error downloading {item.get('filename', 'unknown')}: {e}")
+                    success, file_size = False, 0
+                
+                if success:
+                    counts['success'] += 1
+                    session.mark_completed(item['id'])
+                else:
+                    counts['failed'] += 1
+                    session.mark_failed(item['id'])
+                
+                # Update progress
+                counts['done'] += 1
+                total = counts['queued']
+                self.downloader.stats.update(file_size)
+                self.downloader.update_progress(counts['done'], total, (counts['done'] / total) * 100)
+        
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(consume()) for _ in range(self.concurrency)]
+        checkpointer = asyncio.create_task(self._checkpoint_periodically(session))
+        
+        try:
+            await asyncio.gather(*tasks)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("\n\n⏹️  Download cancelled by user")
+            self.downloader.cancelled = True
+            raise
+        finally:
+            # Never leave workers running behind us, whether we were cancelled
+            # or the producer failed
+            checkpointer.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(checkpointer, *tasks, return_exceptions=True)
+        
+        return counts['success'], counts['failed']
+    
+    async def _checkpoint_periodically(self, session: DownloadSession):
+        """Persist session state at most once per interval, and only when it changed."""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            if session.dirty:
+                await asyncio.to_thread(session.save_state)
+    
     def list_sessions(self):
         """List available download sessions."""
         sessions = DownloadSession.list_sessions()
@@ -307,6 +391,25 @@ class CLIDownloader:
             print(f"📁 Output: {session['output_dir']}")
             print()
     
+    def _skip_items_on_disk(self, session: DownloadSession, output_path: Path) -> List[Dict[str, Any]]:
+        """Mark remaining items whose file is already in the output dir as completed.
+        
+        Lists the directory once instead of checking each file separately.
+        """
+        on_disk = self.downloader.index_output_dir(output_path)
+        
+        remaining = []
+        for item in session.get_remaining_items():
+            try:
+                present = self.downloader.local_filename(item) in on_disk
+            except (KeyError, ValueError):
+                present = False
+            if present:
+                session.mark_completed(item['id'])
+            else:
+                remaining.append(item)
+        return remaining
+    
     async def resume_session(self, session_id: str) -> bool:
         """Resume a download session."""
         print(f"🔄 Resuming session: {session_id}")
@@ -317,7 +420,8 @@ class CLIDownloader:
             print("❌ Session not found")
             return False
         
-        remaining_items = session.get_remaining_items()
+        output_path = Path(session.output_dir)
+        remaining_items = self._skip_items_on_disk(session, output_path)
         if not remaining_items:
             print("✅ Session already completed")
             return True
@@ -325,42 +429,14 @@ class CLIDownloader:
         print(f"📥 Resuming download of {len(remaining_items)} remaining items")
         
         # Continue with remaining items
-        output_path = Path(session.output_dir)
-        success_count = 0
-        failed_count = 0
-        
-        for i, item in enumerate(remaining_items, 1):
-            if self.downloader.cancelled:
-                break
-            
-            try:
-                success, file_size = await self.downloader.download_media_item_async(
-                    item, output_path
-                )
-                
-                if success:
-                    success_count += 1
-                    session.mark_completed(item['id'])
-                else:
-                    failed_count += 1
-                    session.mark_failed(item['id'])
-                
-                # Update progress
-                total_remaining = len(remaining_items)
-                percentage = (i / total_remaining) * 100
-                print(f"\r📥 Progress: {i}/{total_remaining} ({percentage:.1f}%)", end="", flush=True)
-                
-                # Save state periodically
-                if i % 10 == 0:
-                    session.save_state()
-            
-            except KeyboardInterrupt:
-                print("\n\n⏹️  Download cancelled by user")
-                break
-            except Exception as e:
-                print(f"\n❌ Error downloading {item.get('filename', 'unknown')}: {e}")
-                failed_count += 1
-                session.mark_failed(item['id'])
+        try:
+            success_count, failed_count = await self._download_items(
+                # Saved base URLs have expired; refresh them a batch at a time while downloading
+                self.downloader.iter_refreshed_items(remaining_items), output_path, session
+            )
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self._save_cancelled_session(session)
+            raise
         
         # Final status
         session.save_state()
@@ -372,26 +448,29 @@ class CLIDownloader:
         return success_count > 0
 
 
+# Year-first (YYYY-MM-DD) or day-first (DD-MM-YYYY), with '-' or '/' separators
+_DATE_RE = re.compile(r'^(?:(\d{4})([-/])(\d{1,2})\2(\d{1,2})|(\d{1,2})([-/])(\d{1,2})\6(\d{4}))$')
+
+
 def parse_date(date_str: str) -> datetime:
     """Parse date string in various formats."""
-    formats = [
-        '%Y-%m-%d',
-        '%Y/%m/%d',
-        '%d-%m-%Y',
-        '%d/%m/%Y'
-    ]
+    match = _DATE_RE.match(date_str)
+    if not match:
+        raise ValueError(f"Invalid date format: {date_str}")
     
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
+    if match.group(1):
+        year, month, day = match.group(1, 3, 4)
+    else:
+        day, month, year = match.group(5, 7, 8)
     
-    raise ValueError(f"Invalid date format: {date_str}")
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        raise ValueError(f"Invalid date format: {date_str}") from None
 
 
-async def main():
-    """Main CLI entry point."""
+async def main(argv: Optional[List[str]] = None):
+    """Main CLI entry point; argv defaults to sys.argv[1:]."""
     parser = argparse.ArgumentParser(
         description='Google Photos Downloader - CLI Mode',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -411,6 +490,8 @@ Examples:
   
   # Resume session
   python cli_mode.py --resume SESSION_ID
+
+Run from the project root (or use `python -m cli_mode`) so the app package is importable.
         """
     )
     
@@ -429,85 +510,96 @@ Examples:
     parser.add_argument('--output', type=str, default='downloads', help='Output directory')
     parser.add_argument('--media-types', nargs='+', choices=['PHOTO', 'VIDEO'], 
                        default=['PHOTO', 'VIDEO'], help='Media types to download')
+    parser.add_argument('--concurrency', type=int, metavar='N',
+                       help='Number of parallel downloads (default: download.max_workers)')
+    parser.add_argument('--iobuf', type=int, metavar='BYTES',
+                       help='Write buffer size for downloaded files (default: 262144)')
     
     # Convenience options
     parser.add_argument('--last-30-days', action='store_true', help='Download photos from last 30 days')
     parser.add_argument('--last-year', action='store_true', help='Download photos from last year')
     
-    args = parser.parse_args()
-    
-    cli = CLIDownloader()
-    cli.print_header()
+    args = parser.parse_args(argv)
     
-    # Handle non-auth actions
-    if args.list_sessions:
-        cli.list_sessions()
-        return 0
+    async with CLIDownloader(concurrency=args.concurrency, write_buffer_size=args.iobuf) as cli:
+        cli.print_header()
     
-    # Authenticate (unless skipped)
-    if not args.no_auth:
-        if not cli.authenticate():
-            return 1
+        # Handle non-auth actions
+        if args.list_sessions:
+            cli.list_sessions()
+            return 0
     
-    try:
-        # List albums
-        if args.list_albums:
-            success = await cli.list_albums()
-            return 0 if success else 1
-        
-        # Resume session
-        if args.resume:
-            if not cli.downloader:
-                print("❌ Authentication required for resume")
+        # Authenticate (unless skipped) without blocking the event loop
+        if not args.no_auth:
+            if not await asyncio.to_thread(cli.authenticate):
                 return 1
-            success = await cli.resume_session(args.resume)
-            return 0 if success else 1
+    
+        try:
+            # List albums
+            if args.list_albums:
+                success = await cli.list_albums()
+                return 0 if success else 1
         
-        # Date range downloads
-        if args.start_date and args.end_date:
-            try:
-                start_date = parse_date(args.start_date)
-                end_date = parse_date(args.end_date)
+            # Resume session
+            if args.resume:
+                if not cli.downloader:
+                    print("❌ Authentication required for resume")
+                    return 1
+                success = await cli.resume_session(args.resume)
+                return 0 if success else 1
+        
+            # Date range downloads
+            if args.start_date and args.end_date:
+                try:
+                    start_date = parse_date(args.start_date)
+                    end_date = parse_date(args.end_date)
+                    success = await cli.download_by_date_range(
+                        start_date, end_date, args.output, args.media_types
+                    )
+                    return 0 if success else 1
+                except ValueError as e:
+                    print(f"❌ Date error: {e}")
+                    return 1
+        
+            # Convenience date ranges
+            if args.last_30_days:
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=30)
                 success = await cli.download_by_date_range(
                     start_date, end_date, args.output, args.media_types
                 )
                 return 0 if success else 1
-            except ValueError as e:
-                print(f"❌ Date error: {e}")
-                return 1
-        
-        # Convenience date ranges
-        if args.last_30_days:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            success = await cli.download_by_date_range(
-                start_date, end_date, args.output, args.media_types
-            )
-            return 0 if success else 1
         
-        if args.last_year:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
-            success = await cli.download_by_date_range(
-                start_date, end_date, args.output, args.media_types
-            )
-            return 0 if success else 1
+            if args.last_year:
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=365)
+                success = await cli.download_by_date_range(
+                    start_date, end_date, args.output, args.media_types
+                )
+                return 0 if success else 1
         
-        # Album download
-        if args.album_id:
-            success = await cli.download_by_album(args.album_id, args.output)
-            return 0 if success else 1
+            # Album download
+            if args.album_id:
+                success = await cli.download_by_album(args.album_id, args.output)
+                return 0 if success else 1
         
-        # No action specified
-        parser.print_help()
-        return 0
+            # No action specified
+            parser.print_help()
+            return 0
         
-    except KeyboardInterrupt:
-        print("\n\n⏹️  Operation cancelled by user")
-        return 130
+        except KeyboardInterrupt:
+            print("\n\n⏹️  Operation cancelled by user")
+            return 130
 
 
 if __name__ == "__main__":
+    # Optional faster event loop (not available on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         sys.exit(asyncio.run(main()))
     except KeyboardInterrupt:
@@ -4,12 +4,19 @@ Build script for Google Photos Downloader.
 Creates distributable executables for the current platform.
 """
 
+import hashlib
+import os
 import sys
 import subprocess
 import platform
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Stdlib modules the app never imports; leaving them out shrinks the bundle
+# that --onefile unpacks on every launch
+EXCLUDED_MODULES = ["tkinter", "test", "unittest", "pydoc_data", "distutils"]
+
 def check_dependencies():
     """Check if required build tools are available."""
     try:
@@ -21,29 +28,48 @@ def check_dependencies():
         subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"])
         return True
 
+# Camera drawn on a 64x64 steel-blue tile: (method, box, style)
+ICON_SIZE = (64, 64)
+ICON_BACKGROUND = (70, 130, 180, 255)
+ICON_SHAPES = (
+    ("rectangle", (10, 20, 54, 50), {"fill": (255, 255, 255, 255), "outline": (0, 0, 0, 255), "width": 2}),
+    ("ellipse", (20, 25, 44, 45), {"fill": (200, 200, 200, 255), "outline": (0, 0, 0, 255), "width": 2}),
+    ("ellipse", (26, 29, 38, 41), {"fill": (100, 100, 100, 255)}),
+    ("rectangle", (45, 15, 50, 20), {"fill": (255, 255, 0, 255)}),
+)
+
 def create_icon():
-    """Create application icon if it doesn't exist."""
+    """Create application icon if it doesn't exist.
+    
+    Rendered icons are kept as assets/icon.<hash>.ico, keyed on the drawing
+    parameters, so a cached copy is reused instead of drawing it again.
+    """
     icon_path = Path("assets/icon.ico")
     if icon_path.exists():
         print("✅ Icon already exists")
         return
     
+    digest = hashlib.sha1(repr((ICON_SIZE, ICON_BACKGROUND, ICON_SHAPES)).encode()).hexdigest()[:12]
+    cached_path = icon_path.with_name(f"icon.{digest}.ico")
+    if cached_path.exists():
+        shutil.copyfile(cached_path, icon_path)
+        print("✅ Restored icon from cache")
+        return
+    
     try:
         from PIL import Image, ImageDraw
         
         icon_path.parent.mkdir(exist_ok=True)
         
-        # Create 64x64 icon
-        img = Image.new('RGBA', (64, 64), (70, 130, 180, 255))
+        img = Image.new('RGBA', ICON_SIZE, ICON_BACKGROUND)
         draw = ImageDraw.Draw(img)
         
         # Draw camera icon
-        draw.rectangle([10, 20, 54, 50], fill=(255, 255, 255, 255), outline=(0, 0, 0, 255), width=2)
-        draw.ellipse([20, 25, 44, 45], fill=(200, 200, 200, 255), outline=(0, 0, 0, 255), width=2)
-        draw.ellipse([26, 29, 38, 41], fill=(100, 100, 100, 255))
-        draw.rectangle([45, 15, 50, 20], fill=(255, 255, 0, 255))
+        for method, box, style in ICON_SHAPES:
+            getattr(draw, method)(box, **style)
         
-        img.save(icon_path, format='ICO', sizes=[(64, 64), (32, 32), (16, 16)])
+        img.save(cached_path, format='ICO', sizes=[(64, 64), (32, 32), (16, 16)], bitmap_format='png')
+        shutil.copyfile(cached_path, icon_path)
         print("✅ Created application icon")
         
     except ImportError:
@@ -51,10 +77,13 @@ def create_icon():
 
 def build_executable():
     """Build standalone executable."""
-    if not check_dependencies():
-        return False
-    
-    create_icon()
+    # The PyInstaller check and icon drawing are independent, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        deps = executor.submit(check_dependencies)
+        icon = executor.submit(create_icon)
+        icon.result()
+        if not deps.result():
+            return False
     
     print(f"🔨 Building executable for {platform.system()}...")
     
@@ -78,9 +107,13 @@ def build_executable():
     # Add optimization flags
     cmd.extend([
         "--optimize", "2",
-        "--strip",  # Remove debug symbols
         "--noupx"   # Disable UPX compression (can cause antivirus issues)
     ])
+    # Remove debug symbols; Windows has no strip tool to run
+    if platform.system() != "Windows" and shutil.which("strip"):
+        cmd.append("--strip")
+    for module in EXCLUDED_MODULES:
+        cmd.extend(["--exclude-module", module])
     
     try:
         result = subprocess.run(cmd, check=True)
@@ -105,18 +138,30 @@ def clean_build():
     """Clean build artifacts."""
     print("🧹 Cleaning build artifacts...")
     
-    dirs_to_clean = ["build", "dist", "__pycache__"]
-    files_to_clean = ["*.spec"]
-    
-    for dir_name in dirs_to_clean:
-        if Path(dir_name).exists():
-            shutil.rmtree(dir_name)
-            print(f"✅ Removed: {dir_name}/")
-    
-    for pattern in files_to_clean:
-        for file_path in Path(".").glob(pattern):
-            file_path.unlink()
-            print(f"✅ Removed: {file_path}")
+    removed = []
+    for dir_name in ["build", "dist"]:
+        if Path(dir_name).is_dir():
+            removed.append(f"{dir_name}/")
+        shutil.rmtree(dir_name, ignore_errors=True)
+    
+    # Stale bytecode anywhere in the project, not just the top level;
+    # virtualenvs and VCS metadata are left alone
+    for root, dirs, _ in os.walk("."):
+        dirs[:] = [d for d in dirs if d not in (".git", ".venv", "venv")]
+        if "__pycache__" in dirs:
+            dirs.remove("__pycache__")
+            cache_dir = os.path.join(root, "__pycache__")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            removed.append(f"{cache_dir}/")
+    
+    for file_path in Path(".").glob("*.spec"):
+        file_path.unlink(missing_ok=True)
+        removed.append(str(file_path))
+    
+    if removed:
+        print("✅ Removed: " + ", ".join(removed))
+    else:
+        print("✅ Nothing to clean")
 
 def main():
     """Main build function."""
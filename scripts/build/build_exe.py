@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 """
+import argparse
+import hashlib
+import mmap
 import os
 import sys
 import shutil
@@ -8,8 +11,134 @@ import subprocess
 from pathlib import Path
 
 
+def file_sha256(path):
+    """Hash a file through a read-only mmap, one 1 MiB window at a time."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for offset in range(0, len(mm), 1 << 20):
+            digest.update(mm[offset:offset + (1 << 20)])
+    return digest.hexdigest()
+
+
+def copy_with_times(src, dst):
+    """Copy file contents and timestamps only.
+    
+    copyfile takes the sendfile fast path on Linux; docs don't need the rest
+    of copy2's metadata.
+    """
+    shutil.copyfile(src, dst)
+    st = os.stat(src)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def link_or_copy(src, dst, copy):
+    """Hard-link src to dst, falling back to copy() across filesystems.
+    
+    Only for build outputs: a linked file shares its inode with src.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy(src, dst)
+
+
+def build_with_pyinstaller(spec_content, clean):
+    """Build dist/GooglePhotosDownloader from the generated spec; True on success."""
+    # build/ is only reusable for the same spec, dependencies and Python;
+    # the key lives inside it so CI can cache the directory as a whole
+    cache_key_file = Path('build/.cache_key')
+    cache_key = hashlib.sha256(
+        spec_content.encode()
+        + Path('requirements-web-windows.txt').read_bytes()
+        + sys.version.encode()
+    ).hexdigest()[:16]
+    try:
+        cache_stale = cache_key_file.read_text().strip() != cache_key
+    except FileNotFoundError:
+        cache_stale = cache_key_file.parent.exists()
+    if cache_stale and not clean:
+        print("Build cache is from a different spec or dependency set, rebuilding from scratch")
+        clean = True
+    
+    # Write spec file only when it changes, so its mtime doesn't invalidate
+    # PyInstaller's cached analysis
+    spec_path = Path('google_photos_downloader.spec')
+    try:
+        spec_unchanged = spec_path.read_text() == spec_content
+    except FileNotFoundError:
+        spec_unchanged = False
+    if spec_unchanged:
+        print("Spec unchanged, reusing google_photos_downloader.spec")
+    else:
+        print("Creating PyInstaller spec file...")
+        spec_path.write_text(spec_content)
+        print("Created google_photos_downloader.spec")
+    
+    # Run PyInstaller in this interpreter rather than starting a second one
+    print("Running PyInstaller...")
+    try:
+        import PyInstaller.__main__ as pyinstaller_main
+    except ImportError:
+        print("Build failed: PyInstaller is not installed (pip install pyinstaller)")
+        return False
+    
+    args = ['--noconfirm']
+    if clean:
+        args.append('--clean')
+    args.append('google_photos_downloader.spec')
+    # PyInstaller compiles its own bytecode; don't litter the tree with __pycache__
+    sys.dont_write_bytecode = True
+    try:
+        pyinstaller_main.run(args)
+    except SystemExit as e:
+        # PyInstaller exits on failure; a zero/None code is a normal finish
+        if e.code:
+            print(f"Build failed: PyInstaller exited with {e.code}")
+            return False
+    except Exception as e:
+        print(f"Build failed: {e}")
+        return False
+    
+    cache_key_file.parent.mkdir(exist_ok=True)
+    cache_key_file.write_text(cache_key)
+    return True
+
+
+def build_with_nuitka():
+    """Compile start_server.py to a native onefile executable in dist/ with Nuitka."""
+    print("Running Nuitka...")
+    output_name = 'GooglePhotosDownloader.exe' if sys.platform == 'win32' else 'GooglePhotosDownloader'
+    try:
+        subprocess.run([
+            sys.executable, '-m', 'nuitka',
+            '--standalone', '--onefile',
+            '--assume-yes-for-downloads',
+            '--enable-plugin=anti-bloat',
+            '--include-package=app',
+            '--include-package=uvicorn',
+            '--include-package=fastapi',
+            '--include-module=cli_mode',
+            '--include-package-data=googleapiclient',
+            '--include-data-dir=static=static',
+            '--output-dir=dist',
+            f'--output-filename={output_name}',
+            'start_server.py',
+        ], check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Build failed: Nuitka exited with {e.returncode} (is it installed? pip install nuitka)")
+        return False
+    return True
+
+
 def main():
-    """Build executable using PyInstaller."""
+    """Build executable using PyInstaller (or Nuitka with --backend nuitka)."""
+    parser = argparse.ArgumentParser(description="Build the Google Photos Downloader executable")
+    parser.add_argument("--clean", action="store_true",
+                        help="Remove previous build output and PyInstaller's cache first (full rebuild)")
+    parser.add_argument("--backend", choices=["pyinstaller", "nuitka"], default="pyinstaller",
+                        help="Packager to use; nuitka compiles to C for faster startup but builds much slower")
+    cli_args = parser.parse_args()
+    
     print("Building Google Photos Downloader executable...")
     print("=" * 60)
     
@@ -18,18 +147,47 @@ def main():
     os.chdir(project_root)
     print(f"Working directory: {project_root}")
     
-    # Clean previous builds
-    print("Cleaning previous builds...")
-    for dir_name in ['build', 'dist', '__pycache__']:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-            print(f"Removed {dir_name}/")
+    # Keep build/ between runs so PyInstaller can reuse its cached analysis
+    if cli_args.clean:
+        print("Cleaning previous builds...")
+        for dir_name in ['build', 'dist']:
+            if os.path.exists(dir_name):
+                shutil.rmtree(dir_name)
+                print(f"Removed {dir_name}/")
     
     # Create spec file content
     spec_content = '''# -*- mode: python ; coding: utf-8 -*-
 
+import sys
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules, copy_metadata
+
 block_cipher = None
 
+# Discover submodules at build time so new modules under app/ are never left out
+sys.path.insert(0, SPECPATH)
+hiddenimports = (
+    collect_submodules('app')
+    + collect_submodules('uvicorn')
+    + collect_submodules('starlette')
+    + collect_submodules('fastapi')
+    + [
+        'google.auth.transport.requests',
+        'google_auth_oauthlib.flow',
+        'googleapiclient.discovery',
+        'googleapiclient.errors',
+        'cli_mode',
+    ]
+)
+
+# Google client libraries look up their own distribution metadata at runtime,
+# and googleapiclient ships its discovery documents as package data
+google_datas = (
+    copy_metadata('google-auth')
+    + copy_metadata('google-auth-oauthlib')
+    + copy_metadata('google-api-python-client')
+    + collect_data_files('googleapiclient')
+)
+
 # Add all Python files that need to be included
 a = Analysis(
     ['start_server.py'],
@@ -43,32 +201,8 @@ a = Analysis(
         ('OAUTH_GUIDE.md', '.'),
         ('README.md', '.'),
         ('INSTALL_WINDOWS.md', '.'),
-    ],
-    hiddenimports=[
-        'app.main',
-        'app.api.routes',
-        'app.api.websockets',
-        'app.core.config',
-        'app.core.downloader',
-        'app.core.session',
-        'app.models.schemas',
-        'uvicorn.main',
-        'uvicorn.config',
-        'uvicorn.server',
-        'fastapi',
-        'fastapi.staticfiles',
-        'starlette.applications',
-        'starlette.routing',
-        'starlette.middleware',
-        'google.auth.transport.requests',
-        'google_auth_oauthlib.flow',
-        'googleapiclient.discovery',
-        'googleapiclient.errors',
-        'cli_mode',
-        'argparse',
-        'datetime',
-        'threading',
-    ],
+    ] + google_datas,
+    hiddenimports=hiddenimports,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -93,7 +227,16 @@ exe = EXE(
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
-    upx_exclude=[],
+    # Runtime DLLs and extension modules compress poorly and slow every launch
+    upx_exclude=[
+        'python*.dll',
+        'vcruntime*.dll',
+        'api-ms-win-*.dll',
+        'MSVCP*.dll',
+        '_ssl.pyd',
+        '_hashlib.pyd',
+        'unicodedata.pyd',
+    ],
     runtime_tmpdir=None,
     console=True,
     disable_windowed_traceback=False,
@@ -104,28 +247,13 @@ exe = EXE(
 )
 '''
     
-    # Write spec file
-    print("Creating PyInstaller spec file...")
-    with open('google_photos_downloader.spec', 'w') as f:
-        f.write(spec_content)
-    print("Created google_photos_downloader.spec")
-    
-    # Run PyInstaller
-    print("Running PyInstaller...")
-    try:
-        result = subprocess.run([
-            sys.executable, '-m', 'PyInstaller',
-            '--clean',
-            'google_photos_downloader.spec'
-        ], check=True, capture_output=True, text=True)
-        
-        print("Build completed successfully!")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Build failed: {e}")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
+    if cli_args.backend == 'nuitka':
+        built = build_with_nuitka()
+    else:
+        built = build_with_pyinstaller(spec_content, cli_args.clean)
+    if not built:
         return 1
+    print("Build completed successfully!")
     
     # Check if executable was created (handle both Windows and Unix)
     exe_paths = [
@@ -143,6 +271,7 @@ exe = EXE(
         size_mb = exe_path.stat().st_size / (1024 * 1024)
         print(f"Executable created: {exe_path}")
         print(f"Size: {size_mb:.1f} MB")
+        print(f"SHA256: {file_sha256(exe_path)}")
         
         # Create distribution folder
         dist_folder = Path('distribution')
@@ -153,18 +282,19 @@ exe = EXE(
         # Copy executable (preserve name for cross-platform compatibility)
         exe_name = 'GooglePhotosDownloader.exe' if exe_path.suffix == '.exe' else 'GooglePhotosDownloader'
         target_exe = dist_folder / exe_name
-        shutil.copy2(exe_path, target_exe)
+        link_or_copy(exe_path, target_exe, shutil.copy2)
         
         # Make executable on Unix systems
         if not exe_path.suffix == '.exe':
             os.chmod(target_exe, 0o755)
         
-        # Copy documentation from project root
+        # Copy documentation from project root; real copies, since a hard link
+        # would let edits in distribution/ change the tracked sources
         project_root = Path.cwd()
         for doc in ['README.md', 'OAUTH_GUIDE.md', 'INSTALL_WINDOWS.md']:
             doc_path = project_root / doc
             if doc_path.exists():
-                shutil.copy2(doc_path, dist_folder)
+                copy_with_times(doc_path, dist_folder / doc_path.name)
                 print(f"Copied {doc}")
         
         # Create setup instructions
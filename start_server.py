@@ -2,13 +2,136 @@
 """
 Starts the web server and opens the browser automatically.
 """
+import hashlib
 import os
 import sys
-import time
 import subprocess
-import webbrowser
+import sysconfig
+from importlib import metadata
+from importlib.util import find_spec
 from pathlib import Path
 
+# Modules the web server cannot start without
+REQUIRED_MODULES = ("fastapi", "uvicorn", "pydantic")
+
+# Installed when no requirements file is shipped alongside this script
+FALLBACK_PACKAGES = [
+    "fastapi==0.100.1",
+    "uvicorn==0.23.2",
+    "pydantic==1.10.13",
+    "python-multipart==0.0.6",
+    "websockets==11.0.3",
+    "google-auth-oauthlib==0.7.1",
+    "google-auth-httplib2==0.1.0",
+    "google-api-python-client==2.100.0",
+    "requests==2.31.0",
+    "python-dotenv==1.0.0"
+]
+
+# Keep pip from checking PyPI for its own updates or prompting
+PIP_INSTALL = [sys.executable, "-m", "pip", "install",
+               "--disable-pip-version-check", "--no-input", "--only-binary=all"]
+
+def requirements_file():
+    """Return the requirements file install_and_restart would use, if any."""
+    names = ("requirements-web.txt",)
+    if sys.platform == "win32":
+        names = ("requirements-web-windows.txt",) + names
+    for name in names:
+        path = Path(name)
+        if path.exists():
+            return path
+    return None
+
+def _below_minimum(req, installed):
+    """Whether installed is older than the lowest version req accepts.
+    
+    Pins and upper bounds are ignored: a newer release than the one pinned
+    is assumed to work, so only ==, ~=, >= and > lower bounds are compared.
+    """
+    from packaging.version import InvalidVersion, Version
+    try:
+        installed = Version(installed)
+    except InvalidVersion:
+        return False
+    for spec in req.specifier:
+        if spec.operator not in ("==", "~=", ">=", ">") or "*" in spec.version:
+            continue
+        minimum = Version(spec.version)
+        if installed < minimum or (spec.operator == ">" and installed == minimum):
+            return True
+    return False
+
+def _unmet_requirements(lines):
+    """Return requirement lines that are missing or older than they allow."""
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        Requirement = None
+    
+    unmet = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        
+        if Requirement is None:
+            # Without packaging, only check that unconditional requirements are present
+            if ";" in line:
+                continue
+            name = line.split("=")[0].split(">")[0].split("<")[0].split("[")[0].strip()
+            try:
+                metadata.version(name)
+            except metadata.PackageNotFoundError:
+                unmet.append(line)
+            continue
+        
+        req = Requirement(line)
+        if req.marker and not req.marker.evaluate():
+            continue
+        try:
+            installed = metadata.version(req.name)
+        except metadata.PackageNotFoundError:
+            unmet.append(line)
+            continue
+        if _below_minimum(req, installed):
+            unmet.append(line)
+    return unmet
+
+def _deps_sentinel(req_file):
+    """Sentinel path marking req_file as satisfied for this interpreter."""
+    digest = hashlib.sha1(sys.executable.encode() + b"\0" + req_file.read_bytes()).hexdigest()[:12]
+    return Path(f".deps_ok_{digest}")
+
+def _mark_deps_ok(req_file):
+    """Record that req_file is satisfied so later launches skip the check."""
+    try:
+        _deps_sentinel(req_file).touch()
+    except OSError:
+        pass
+
+def missing_dependencies():
+    """Return required modules that can't be imported.
+    
+    Nothing is imported and pip is never run; only these modules block startup.
+    """
+    return [name for name in REQUIRED_MODULES if find_spec(name) is None]
+
+def outdated_requirements():
+    """Return requirement lines that are missing or older than they allow.
+    
+    Once a requirements file has been checked for this interpreter, a
+    sentinel file lets later launches skip the metadata scan.
+    """
+    req_file = requirements_file()
+    if req_file is None or _deps_sentinel(req_file).exists():
+        return []
+    
+    unmet = _unmet_requirements(req_file.read_text(encoding="utf-8").splitlines())
+    if not unmet:
+        _mark_deps_ok(req_file)
+    return unmet
+
 def main():
     """Launch the web server and open browser."""
     # Check if CLI mode was requested
@@ -18,6 +141,9 @@ def main():
     print("🚀 Google Photos Downloader - Web Version v2.0.0")
     print("=" * 50)
     
+    # Auto-reload watches the source tree and re-imports the app; development only
+    dev_mode = "--dev" in sys.argv or "--reload" in sys.argv
+    
     # Change to script directory
     script_dir = Path(__file__).parent.absolute()
     os.chdir(script_dir)
@@ -33,6 +159,19 @@ def main():
     
     print("✅ Found credentials.json")
     
+    # Only shell out to pip when something is actually missing
+    missing = missing_dependencies()
+    if missing:
+        print(f"❌ Missing dependencies: {', '.join(missing)}")
+        print("📦 Installing required packages...")
+        return install_and_restart()
+    
+    # Older or absent optional packages are reported but never block startup
+    outdated = outdated_requirements()
+    if outdated:
+        print(f"⚠️  Requirements not met: {', '.join(outdated)}")
+        print(f"💡 To update: {sys.executable} -m pip install -r {requirements_file()}")
+    
     # Import and start server
     try:
         import uvicorn
@@ -40,11 +179,25 @@ def main():
         print("🌐 Starting web server on http://127.0.0.1:8000")
         print("📱 Opening browser automatically...")
         print("⏹️  Press Ctrl+C to stop the server")
+        if dev_mode:
+            print("🔁 Development mode: auto-reload enabled")
         print("-" * 50)
         
-        # Open browser after short delay
+        # Only needed once the server is actually launching
+        import socket
+        import threading
+        import time
+        import webbrowser
+        
+        # Open browser as soon as the server accepts connections
         def open_browser():
-            time.sleep(2)
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                try:
+                    socket.create_connection(("127.0.0.1", 8000), timeout=0.5).close()
+                    break
+                except OSError:
+                    time.sleep(0.05)
             try:
                 webbrowser.open("http://127.0.0.1:8000")
             except Exception as e:
@@ -52,7 +205,6 @@ def main():
                 print("💻 Please open http://127.0.0.1:8000 manually")
         
         # Start browser opener in background
-        import threading
         browser_thread = threading.Thread(target=open_browser, daemon=True)
         browser_thread.start()
         
@@ -61,7 +213,7 @@ def main():
             "app.main:app",
             host="127.0.0.1",
             port=8000,
-            reload=True,
+            reload=dev_mode,
             log_level="info"
         )
         
@@ -80,44 +232,22 @@ def main():
 def install_and_restart():
     """Install dependencies and restart."""
     try:
-        # Try Windows-specific requirements first using pathlib
-        windows_req = Path("requirements-web-windows.txt")
-        web_req = Path("requirements-web.txt")
+        # Windows-specific requirements are preferred on Windows when present
+        req_file = requirements_file()
         
-        if windows_req.exists():
-            print("📦 Installing Windows-compatible packages...")
-            subprocess.run([
-                sys.executable, "-m", "pip", "install", 
-                "--only-binary=all", "-r", str(windows_req)
-            ], check=True)
-        elif web_req.exists():
-            print("📦 Installing from requirements-web.txt...")
-            subprocess.run([
-                sys.executable, "-m", "pip", "install",
-                "--only-binary=all", "-r", str(web_req)
-            ], check=True)
+        if req_file is not None:
+            print(f"📦 Installing from {req_file}...")
+            subprocess.run(PIP_INSTALL + ["-r", str(req_file)], check=True)
+            _mark_deps_ok(req_file)
         else:
-            print("📦 Installing individual packages...")
-            packages = [
-                "fastapi==0.100.1",
-                "uvicorn==0.23.2",
-                "pydantic==1.10.13",
-                "python-multipart==0.0.6",
-                "websockets==11.0.3",
-                "google-auth-oauthlib==0.7.1",
-                "google-auth-httplib2==0.1.0",
-                "google-api-python-client==2.100.0",
-                "requests==2.31.0",
-                "python-dotenv==1.0.0"
-            ]
-            
-            for package in packages:
-                subprocess.run([
-                    sys.executable, "-m", "pip", "install", 
-                    "--only-binary=all", package
-                ], check=True)
+            print("📦 Installing required packages...")
+            # Only hand pip what isn't already satisfied; one run resolves them together
+            packages = _unmet_requirements(FALLBACK_PACKAGES)
+            if packages:
+                subprocess.run(PIP_INSTALL + packages, check=True)
         
         print("✅ Dependencies installed successfully!")
+        precompile_packages()
         print("🔄 Restarting server...")
         
         # Restart this script
@@ -134,13 +264,26 @@ def install_and_restart():
         input("Press Enter to exit...")
         return 1
 
+def precompile_packages():
+    """Byte-compile site-packages so the server's first imports skip compilation."""
+    print("⚙️  Precompiling installed packages...")
+    # -j 0 compiles on every CPU; files with an up-to-date .pyc are skipped
+    result = subprocess.run([
+        sys.executable, "-m", "compileall", "-q", "-j", "0",
+        sysconfig.get_paths()["purelib"]
+    ])
+    if result.returncode != 0:
+        print("⚠️  Some packages could not be precompiled; they will compile on first import")
+
 def launch_cli_mode():
     """Launch CLI mode."""
     try:
         # Import and run CLI mode
         import cli_mode
         import asyncio
-        return asyncio.run(cli_mode.main())
+        # Runs in this interpreter; drop our own --cli flag before cli_mode parses the rest
+        argv = sys.argv[2:] if sys.argv[1] == '--cli' else sys.argv[1:]
+        return asyncio.run(cli_mode.main(argv))
     except ImportError:
         print("❌ CLI mode not available in this build")
         return 1
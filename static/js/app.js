@@ -50,6 +50,11 @@ function googlePhotosApp() {
         isDownloading: false,
         showSessions: false,
         statusMessages: [],
+        pendingStatus: [],
+        logSeq: 0,
+        logScrollPending: false,
+        logTimeSecond: 0,
+        logTimeText: '',
         
         // Notifications
         notification: {
@@ -75,9 +80,10 @@ function googlePhotosApp() {
         async init() {
             console.log('🚀 Initializing Google Photos Downloader Web App');
             
-            // Initialize default dates
-            this.downloadConfig.startDate = this.getDefaultStartDate();
-            this.downloadConfig.endDate = this.getDefaultEndDate();
+            // Initialize default dates from a single clock read so both agree
+            const now = new Date();
+            this.downloadConfig.startDate = this.getDefaultStartDate(now);
+            this.downloadConfig.endDate = this.getDefaultEndDate(now);
             this.downloadConfig.outputDir = this.getDefaultOutputDir();
             
             // Check authentication status
@@ -92,14 +98,14 @@ function googlePhotosApp() {
         },
         
         // Helper methods
-        getDefaultStartDate() {
-            const date = new Date();
+        getDefaultStartDate(now = new Date()) {
+            const date = new Date(now);
             date.setFullYear(date.getFullYear() - 1);
             return date.toISOString().split('T')[0];
         },
         
-        getDefaultEndDate() {
-            return new Date().toISOString().split('T')[0];
+        getDefaultEndDate(now = new Date()) {
+            return now.toISOString().split('T')[0];
         },
         
         getDefaultOutputDir() {
@@ -183,6 +189,16 @@ function googlePhotosApp() {
         },
         
         // Albums methods
+        sameAlbums(albums) {
+            if (albums.length !== this.albums.length) return false;
+            return albums.every((album, i) => {
+                const current = this.albums[i];
+                return album.id === current.id &&
+                    album.title === current.title &&
+                    album.media_items_count === current.media_items_count;
+            });
+        },
+        
         async loadAlbums() {
             if (!this.authStatus.authenticated) {
                 this.showNotification('Veuillez d\'abord vous authentifier', 'error');
@@ -192,8 +208,12 @@ function googlePhotosApp() {
             this.loading.albums = true;
             try {
                 this.addStatusMessage('🔄 Chargement des albums...', 'info');
-                this.albums = await this.apiRequest('/albums');
-                this.addStatusMessage(`✅ ${this.albums.length} albums chargés`, 'success');
+                const albums = await this.apiRequest('/albums');
+                // Leave the select untouched when a refresh returns the same albums
+                if (!this.sameAlbums(albums)) {
+                    this.albums = albums;
+                }
+                this.addStatusMessage(`✅ ${albums.length} albums chargés`, 'success');
             } catch (error) {
                 this.addStatusMessage(`❌ Échec du chargement des albums : ${error.message}`, 'error');
                 this.showNotification('Échec du chargement des albums', 'error');
@@ -390,29 +410,57 @@ function googlePhotosApp() {
             this.showNotification('Veuillez entrer le chemin du dossier manuellement', 'info');
         },
         
+        logTime(now) {
+            // Messages arrive in bursts, so reuse the formatted time within the same second
+            const second = Math.floor(now / 1000);
+            if (second !== this.logTimeSecond) {
+                this.logTimeSecond = second;
+                this.logTimeText = this.formatTime(now);
+            }
+            return this.logTimeText;
+        },
+        
         addStatusMessage(message, level = 'info') {
-            this.statusMessages.push({
+            const now = Date.now();
+            this.pendingStatus.push({
+                id: ++this.logSeq,
                 message,
                 level,
-                timestamp: new Date().toISOString()
+                timestamp: new Date(now).toISOString(),
+                time: this.logTime(now)
             });
             
-            // Keep only last 100 messages
-            if (this.statusMessages.length > 100) {
-                this.statusMessages = this.statusMessages.slice(-100);
+            // Only the last 100 are ever shown, so don't let a backlog grow past that
+            if (this.pendingStatus.length > 100) {
+                this.pendingStatus.splice(0, this.pendingStatus.length - 100);
             }
             
-            // Auto-scroll to bottom (using setTimeout to ensure DOM is updated)
-            setTimeout(() => {
-                const logContainer = document.querySelector('.bg-gray-900');
-                if (logContainer) {
-                    logContainer.scrollTop = logContainer.scrollHeight;
+            // Render queued messages and scroll once per frame, however many arrived.
+            // Background tabs don't run animation frames, so fall back to a timer there.
+            if (this.logScrollPending) return;
+            this.logScrollPending = true;
+            const schedule = document.hidden ? (fn) => setTimeout(fn, 250) : (fn) => requestAnimationFrame(fn);
+            schedule(() => {
+                this.logScrollPending = false;
+                this.statusMessages.push(...this.pendingStatus.splice(0));
+                
+                // Keep only last 100 messages (trim in place instead of copying the array)
+                if (this.statusMessages.length > 100) {
+                    this.statusMessages.splice(0, this.statusMessages.length - 100);
                 }
-            }, 50);
+                
+                this.$nextTick(() => {
+                    const logContainer = document.querySelector('.bg-gray-900');
+                    if (logContainer) {
+                        logContainer.scrollTop = logContainer.scrollHeight;
+                    }
+                });
+            });
         },
         
         clearLog() {
             this.statusMessages = [];
+            this.pendingStatus = [];
             this.addStatusMessage('Journal d\'état vidé', 'info');
         },
         
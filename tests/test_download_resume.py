@@ -0,0 +1,109 @@
+"""
+Download retry and resume behaviour against a local HTTP server.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app.core.downloader as downloader_module
+from app.core.config import ConfigManager
+from app.core.downloader import COPY_CHUNK_SIZE, GooglePhotosDownloader
+
+BODY = bytes(range(256)) * 12288  # 3 MiB, several copy blocks
+CUT_AT = COPY_CHUNK_SIZE + COPY_CHUNK_SIZE // 2
+READ_TIMEOUT = 0.5
+
+
+class FlakyMediaHandler(BaseHTTPRequestHandler):
+    """Serves BODY, failing mid-body on the first full request.
+    
+    ``failure`` is 'close' (connection dropped) or 'stall' (no more bytes
+    until after the client's read timeout).
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    requests_seen = []
+    encodings_seen = []
+    drop_first = True
+    failure = 'close'
+    
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        type(self).requests_seen.append(range_header)
+        type(self).encodings_seen.append(self.headers.get('Accept-Encoding'))
+        
+        if range_header:
+            start = int(range_header[len('bytes='):].rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(BODY) - 1}/{len(BODY)}')
+            self.send_header('Content-Length', str(len(BODY) - start))
+            self.end_headers()
+            self.wfile.write(BODY[start:])
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        if type(self).drop_first:
+            type(self).drop_first = False
+            self.wfile.write(BODY[:CUT_AT])
+            self.wfile.flush()
+            if type(self).failure == 'stall':
+                time.sleep(READ_TIMEOUT * 3)
+            self.close_connection = True
+            return
+        self.wfile.write(BODY)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(params=['close', 'stall'])
+def media_server(request):
+    FlakyMediaHandler.requests_seen = []
+    FlakyMediaHandler.encodings_seen = []
+    FlakyMediaHandler.drop_first = True
+    FlakyMediaHandler.failure = request.param
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyMediaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/media"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader_module, 'backoff_delay', lambda *args: 0)
+    config = ConfigManager(str(tmp_path / 'config.json'))
+    config.set('download.timeout', READ_TIMEOUT)
+    instance = GooglePhotosDownloader(config=config)
+    instance.set_callbacks(status_callback=lambda message: None)
+    yield instance
+    instance.close()
+
+
+def _item(base_url):
+    return {
+        'id': 'item-1',
+        'filename': 'a.jpg',
+        'baseUrl': base_url,
+        'mediaMetadata': {'creationTime': '2023-05-01T12:34:56Z', 'photo': {}},
+    }
+
+
+def test_dropped_connection_resumes_with_range(media_server, downloader, tmp_path):
+    success, size = downloader.download_media_item(_item(media_server), tmp_path)
+    
+    assert success
+    assert size == len(BODY)
+    # A stalled read loses the partially filled block, so it resumes from the
+    # last block written; a closed connection keeps everything received
+    resume_at = CUT_AT if FlakyMediaHandler.failure == 'close' else COPY_CHUNK_SIZE
+    assert FlakyMediaHandler.requests_seen == [None, f'bytes={resume_at}-']
+    # Compressed bodies would make the Range offset disagree with the file
+    assert FlakyMediaHandler.encodings_seen == ['identity', 'identity']
+    assert (tmp_path / '20230501_123456_a.jpg').read_bytes() == BODY
+    assert not (tmp_path / '20230501_123456_a.jpg.tmp').exists()
@@ -0,0 +1,122 @@
+"""
+Session persistence: state.json snapshots, the legacy format and progress.log replay.
+"""
+import json
+import os
+
+import pytest
+
+import app.core.session as session_module
+from app.core.session import DownloadSession
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_module, 'SESSIONS_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _items(count):
+    return [
+        {'id': f'item-{i}', 'filename': f'{i}.jpg', 'baseUrl': f'https://example.com/{i}'}
+        for i in range(count)
+    ]
+
+
+def _remaining_ids(session):
+    return [item['id'] for item in session.get_remaining_items()]
+
+
+def test_save_and_load_round_trip():
+    session = DownloadSession()
+    session.output_dir = 'downloads'
+    session.download_params = {'source_type': 'album', 'album_id': 'a1'}
+    session.media_items = _items(10)
+    session.total_items = 10
+    session.mark_completed('item-0')
+    session.mark_completed('item-9')
+    session.mark_failed('item-3')
+    session.save_state()
+    session.close()
+
+    loaded = DownloadSession.load_state(session.session_id)
+
+    assert loaded.output_dir == 'downloads'
+    assert loaded.download_params == {'source_type': 'album', 'album_id': 'a1'}
+    assert loaded.media_items == _items(10)
+    assert loaded.total_items == 10
+    assert loaded.completed_item_ids == {'item-0', 'item-9'}
+    assert loaded.failed_item_ids == {'item-3'}
+    assert (loaded.completed_items, loaded.failed_items) == (2, 1)
+    assert _remaining_ids(loaded) == ['item-1', 'item-2', 'item-4', 'item-5', 'item-6', 'item-7', 'item-8']
+
+    summary, = DownloadSession.list_sessions()
+    assert summary['session_id'] == session.session_id
+    assert (summary['completed_items'], summary['failed_items']) == (2, 1)
+    loaded.close()
+
+
+def test_load_legacy_id_lists(sessions_dir):
+    session_dir = sessions_dir / 'legacy'
+    session_dir.mkdir()
+    (session_dir / 'state.json').write_text(json.dumps({
+        'session_id': 'legacy',
+        'created_at': '2023-05-01T12:00:00',
+        'last_updated': '2023-05-01T12:30:00',
+        'total_items': 4,
+        'completed_items': 2,
+        'failed_items': 1,
+        'output_dir': 'downloads',
+        'download_params': {},
+        'media_items': _items(4),
+        'completed_item_ids': ['item-0', 'item-2'],
+        'failed_item_ids': ['item-1'],
+    }))
+
+    loaded = DownloadSession.load_state('legacy')
+
+    assert loaded.completed_item_ids == {'item-0', 'item-2'}
+    assert loaded.failed_item_ids == {'item-1'}
+    assert (loaded.completed_items, loaded.failed_items) == (2, 1)
+    assert _remaining_ids(loaded) == ['item-3']
+    # No meta.json yet, so the summary comes from state.json
+    summary, = DownloadSession.list_sessions()
+    assert summary['session_id'] == 'legacy'
+    loaded.close()
+
+
+def test_progress_log_replayed_after_crash():
+    session = DownloadSession()
+    session.media_items = _items(5)
+    session.total_items = 5
+    session.mark_completed('item-0')
+    session.save_state()
+
+    # Recorded only in the progress log; the process dies before the next snapshot
+    session.mark_completed('item-1')
+    session.mark_failed('item-4')
+    session.flush_progress()
+
+    loaded = DownloadSession.load_state(session.session_id)
+
+    assert loaded.completed_item_ids == {'item-0', 'item-1'}
+    assert loaded.failed_item_ids == {'item-4'}
+    assert (loaded.completed_items, loaded.failed_items) == (2, 1)
+    assert _remaining_ids(loaded) == ['item-2', 'item-3']
+    session.close()
+    loaded.close()
+
+
+def test_save_state_truncates_progress_log():
+    session = DownloadSession()
+    session.media_items = _items(3)
+    session.mark_completed('item-0')
+    session.flush_progress()
+    progress_log = os.path.join(session.session_dir, 'progress.log')
+    assert os.path.getsize(progress_log) > 0
+
+    session.save_state()
+
+    assert os.path.getsize(progress_log) == 0
+    assert not session.dirty
+    session.close()